@@ -9,12 +9,217 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import cv2
 import numpy as np
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Optional, Tuple, Dict
 import threading
+import queue
 import os
+import sys
+import shutil
+import subprocess
+import time
 from pathlib import Path
 from enum import Enum
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+import math
+import heapq
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# Same-strength regions share one bounding-box blur when it covers at most this multiple of their area
+GROUP_BLUR_MAX_OVERDRAW = 1.5
+
+# Export blurs above this kernel size use the constant-time Gaussian approximation
+EXPORT_GAUSSIAN_MAX_KSIZE = 15
+
+# Exact export blurs from this kernel size up use sepFilter2D with a cached kernel; it beats GaussianBlur's
+# fixed-point path there (within 1 LSB of it)
+EXPORT_SEPARABLE_MIN_KSIZE = 7
+
+# Export blurs at or above this kernel size run on an image pyramid (pyrDown -> blur -> pyrUp)
+EXPORT_PYRAMID_MIN_KSIZE = 25
+
+# Preview blurs with large kernels run on a copy downscaled by this factor
+PREVIEW_BLUR_DOWNSCALE = 4
+
+# With Numba installed, previews with at least this many active regions use the JIT box blur
+NUMBA_MIN_REGIONS = 4
+
+# Previews whose regions cover at least this fraction of the frame blur luma only, in I420
+PREVIEW_LUMA_MIN_COVERAGE = 0.10
+
+# Set VIDEO_BLUR_PROFILE=1 to time decode/resize/blur with cv2.getTickCount
+DEBUG_PROFILE = os.environ.get("VIDEO_BLUR_PROFILE") == "1"
+
+# Hardware H.264 encoders tried, in order, for the FFmpeg export pipe
+HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_videotoolbox", "h264_amf", "h264_vaapi")
+
+# Software encoder the FFmpeg pipe falls back to when no hardware one opens, and its extra options
+SOFTWARE_ENCODER = "libx264"
+ENCODER_OPTIONS = {"libx264": ("-preset", "ultrafast")}
+
+# Faces are re-detected this often (seconds) while tracking: a lost face is taken back, and a tracked
+# one snapped to the detection, when it overlaps the face's last box by at least this IoU
+FACE_REDETECT_INTERVAL = 1.0
+FACE_REDETECT_MIN_IOU = 0.3
+
+# Corners the Lucas-Kanade tracker follows per box, and the fewest it can keep before re-seeding
+LK_MAX_CORNERS = 20
+LK_MIN_CORNERS = 4
+
+# CUDA flow tracking: a pixel's flow is trusted when following it forward and then back lands within
+# this many pixels of where it started; the box is lost once fewer than this share of it is trusted
+FLOW_FB_MAX_ERROR = 1.0
+FLOW_MIN_CONSISTENT = 0.5
+# It is also lost when the box's pixels, moved along the flow, correlate with the last frame below this
+FLOW_MIN_CORRELATION = 0.5
+
+# Frames buffered between each pair of export pipeline stages
+EXPORT_QUEUE_DEPTH = 8
+
+# Optional YuNet face model (OpenCV Zoo ONNX); when the file exists it replaces the Haar cascades
+YUNET_MODEL_PATH = os.environ.get(
+    "VIDEO_BLUR_YUNET_MODEL", str(Path(__file__).with_name("face_detection_yunet_2023mar.onnx")))
+YUNET_SCORE_THRESHOLD = 0.7
+
+# Default long side, in pixels, frames are shrunk to before face detection (0 = full resolution)
+FACE_DETECT_MAX_SIDE = 640
+
+# Top of the detect size slider, which stands for full resolution
+FACE_DETECT_FULL_SIDE = 1920
+
+# Plate detection runs Canny on frames shrunk to at most this width
+PLATE_DETECT_MAX_WIDTH = 1280
+
+# Decoder pixel formats (FFmpeg fourccs) whose first plane is 8-bit luma, usable as gray as-is
+LUMA_PLANE_FORMATS = ("I420", "YV12", "Y42B", "444P", "NV12", "NV21", "Y800")
+
+# Sampled grayscale frames buffered between the face scan's decode and detect stages
+SCAN_QUEUE_DEPTH = 16
+
+# OpenCV's internal thread pool size; stages that already run a thread per core shrink it while active
+OPENCV_THREADS = max(1, (os.cpu_count() or 1) - 1)
+
+# Face scan detector threads, each with its own cascade (a CascadeClassifier is not safe to share);
+# detectMultiScale releases the GIL, so one per core keeps them all busy
+SCAN_DETECT_WORKERS = os.cpu_count() or 1
+
+# Face scan decoders, each with its own capture over a contiguous stretch of the video; one decoder
+# grabbing every frame can't keep a detector per core busy
+SCAN_READ_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 4))
+
+# Export blur-stage threads; OpenCV releases the GIL, so whole frames blur in parallel and the
+# writer puts them back in order
+EXPORT_BLUR_WORKERS = os.cpu_count() or 1
+
+# Minimum seconds between export progress updates pushed to the Tk event loop
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Decoded-frame LRU bounds: at most this many frames and roughly this many bytes
+FRAME_CACHE_MAX_FRAMES = 64
+FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# A cache miss just behind the decoder also decodes up to this many frames before it, so stepping
+# backwards costs one keyframe seek per run of frames instead of one per frame
+BACKSTEP_FILL_FRAMES = 16
+
+# During playback a background capture decodes up to this many frames ahead into the cache
+PREFETCH_AHEAD_FRAMES = 16
+
+
+if HAS_NUMBA:
+    @numba.njit(inline='always')
+    def _reflect101(i, n):
+        """Index i mirrored into [0, n) like OpenCV's BORDER_REFLECT_101"""
+        if n == 1:
+            return 0
+        while i < 0 or i >= n:
+            i = -i if i < 0 else 2 * n - 2 - i
+        return i
+    
+    @numba.njit(parallel=True, cache=True)
+    def _box_blur_regions_njit(src, dst, rects, boxes, members):
+        """Three-pass box blur of each src rect, pasted into dst over its (x1, y1, x2, y2, rect) members"""
+        # Each pass reflects at the rect's edges like cv2.blur but keeps float sums between passes
+        for i in range(rects.shape[0]):
+            x1, y1, x2, y2 = rects[i, 0], rects[i, 1], rects[i, 2], rects[i, 3]
+            h, w = y2 - y1, x2 - x1
+            r = boxes[i] // 2
+            n = 2 * r + 1
+            buf = src[y1:y2, x1:x2].astype(np.float32)
+            
+            for _ in range(3):
+                for y in numba.prange(h):
+                    line = buf[y].copy()
+                    for c in range(3):
+                        acc = 0.0
+                        for k in range(-r, r + 1):
+                            acc += line[_reflect101(k, w), c]
+                        buf[y, 0, c] = acc / n
+                        for x in range(1, w):
+                            acc += line[_reflect101(x + r, w), c] - line[_reflect101(x - r - 1, w), c]
+                            buf[y, x, c] = acc / n
+                for x in numba.prange(w):
+                    line = buf[:, x].copy()
+                    for c in range(3):
+                        acc = 0.0
+                        for k in range(-r, r + 1):
+                            acc += line[_reflect101(k, h), c]
+                        buf[0, x, c] = acc / n
+                        for y in range(1, h):
+                            acc += line[_reflect101(y + r, h), c] - line[_reflect101(y - r - 1, h), c]
+                            buf[y, x, c] = acc / n
+            
+            for j in range(members.shape[0]):
+                if members[j, 4] != i:
+                    continue
+                mx1, my1, mx2, my2 = members[j, 0], members[j, 1], members[j, 2], members[j, 3]
+                for y in numba.prange(my1, my2):
+                    for x in range(mx1, mx2):
+                        for c in range(3):
+                            dst[y, x, c] = np.uint8(min(255.0, buf[y - y1, x - x1, c] + 0.5))
+
+
+@functools.lru_cache(maxsize=None)
+def _box_width(ksize: int) -> int:
+    """Odd box width whose three passes approximate a Gaussian of kernel size ksize"""
+    # Three boxes of width w have variance (w^2 - 1) / 4; match OpenCV's sigma for ksize
+    sigma = 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+    return max(1, int(round(math.sqrt(4 * sigma * sigma + 1)))) | 1
+
+
+@functools.lru_cache(maxsize=None)
+def _gaussian_kernel(ksize: int) -> np.ndarray:
+    """1-D Gaussian kernel for ksize with OpenCV's default sigma, shared read-only between threads"""
+    kernel = cv2.getGaussianKernel(ksize, 0)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _interp_box(frames: np.ndarray, boxes: np.ndarray, n: int, frame_num: int) -> Tuple[int, int, int, int]:
+    """Box at frame_num from the first n sorted keyframes: exact, held past either end, or lerped"""
+    i = np.searchsorted(frames[:n], frame_num)
+    if i < n and frames[i] == frame_num:
+        return int(boxes[i, 0]), int(boxes[i, 1]), int(boxes[i, 2]), int(boxes[i, 3])
+    if i == 0 or i == n:
+        j = 0 if i == 0 else n - 1
+        return int(boxes[j, 0]), int(boxes[j, 1]), int(boxes[j, 2]), int(boxes[j, 3])
+    t = (frame_num - frames[i - 1]) / (frames[i] - frames[i - 1])
+    p = boxes[i - 1] + t * (boxes[i] - boxes[i - 1])
+    return int(p[0]), int(p[1]), int(p[2]), int(p[3])
+
+
+if HAS_NUMBA:
+    # Runs once per tracked region per exported frame; compiled, it skips numpy's per-call overhead
+    _interp_box = numba.njit(cache=True)(_interp_box)
 
 
 class BlurMode(Enum):
@@ -24,7 +229,62 @@ class BlurMode(Enum):
     LICENSE_PLATE = "plate"
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10; older interpreters keep a per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Executor.shutdown(cancel_futures=) needs Python 3.9; older interpreters still run whatever is
+# queued, and the scan and tracking jobs stop early once the closing event is set
+_SHUTDOWN_CANCEL = {"cancel_futures": True} if sys.version_info >= (3, 9) else {}
+
+
+class TrackedPositions:
+    """frame -> (x, y, w, h) keyframes as frame-sorted int32 arrays, grown by doubling"""
+    __slots__ = ("frames", "boxes", "size")
+    
+    def __init__(self, positions: Optional[Dict[int, Tuple[int, int, int, int]]] = None):
+        self.frames = np.empty(16, np.int32)
+        self.boxes = np.empty((16, 4), np.int32)
+        self.size = 0
+        for frame_num in sorted(positions or ()):
+            self.add(frame_num, *positions[frame_num])
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TrackedPositions):
+            return NotImplemented
+        n = self.size
+        return (n == other.size and np.array_equal(self.frames[:n], other.frames[:n])
+                and np.array_equal(self.boxes[:n], other.boxes[:n]))
+    
+    def __repr__(self) -> str:
+        return f"TrackedPositions({self.size} keyframes)"
+    
+    def add(self, frame_num: int, x: int, y: int, w: int, h: int):
+        """Set the box at frame_num; appending after the last keyframe is amortised O(1)"""
+        n = self.size
+        i = n
+        if n and frame_num <= self.frames[n - 1]:
+            i = int(np.searchsorted(self.frames[:n], frame_num))
+            if self.frames[i] == frame_num:
+                self.boxes[i] = (x, y, w, h)
+                return
+        if n == len(self.frames):
+            self.frames = np.resize(self.frames, 2 * n)
+            self.boxes = np.resize(self.boxes, (2 * n, 4))
+        if i < n:
+            self.frames[i + 1:n + 1] = self.frames[i:n]
+            self.boxes[i + 1:n + 1] = self.boxes[i:n]
+        self.frames[i] = frame_num
+        self.boxes[i] = (x, y, w, h)
+        self.size = n + 1
+    
+    def clear(self):
+        self.size = 0
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class BlurRegion:
     """Represents a blur region with timing and tracking info"""
     x: int
@@ -36,42 +296,275 @@ class BlurRegion:
     blur_strength: int = 51
     mode: BlurMode = BlurMode.MANUAL
     track_id: Optional[int] = None
-    tracked_positions: Dict[int, Tuple[int, int, int, int]] = field(default_factory=dict)
+    tracked_positions: TrackedPositions = field(default_factory=TrackedPositions)
+    
+    def __post_init__(self):
+        # Gaussian kernels need an odd size; enforce it once instead of per frame
+        self.blur_strength |= 1
+        if not isinstance(self.tracked_positions, TrackedPositions):
+            self.tracked_positions = TrackedPositions(self.tracked_positions)
     
     def contains_frame(self, current_time: float) -> bool:
         return self.start_time <= current_time <= self.end_time
     
+    def add_position(self, frame_num: int, x: int, y: int, w: int, h: int):
+        """Record the tracked box at a frame"""
+        self.tracked_positions.add(frame_num, x, y, w, h)
+    
     def get_position_at_frame(self, frame_num: int) -> Tuple[int, int, int, int]:
         """Get interpolated position for a frame"""
-        if frame_num in self.tracked_positions:
-            return self.tracked_positions[frame_num]
-        
-        frames = sorted(self.tracked_positions.keys())
-        if not frames:
+        positions = self.tracked_positions
+        if not positions.size:
             return (self.x, self.y, self.width, self.height)
-        
-        if frame_num <= frames[0]:
-            return self.tracked_positions[frames[0]]
-        if frame_num >= frames[-1]:
-            return self.tracked_positions[frames[-1]]
-        
-        for i in range(len(frames) - 1):
-            if frames[i] <= frame_num <= frames[i + 1]:
-                t = (frame_num - frames[i]) / (frames[i + 1] - frames[i])
-                p1 = self.tracked_positions[frames[i]]
-                p2 = self.tracked_positions[frames[i + 1]]
-                return (
-                    int(p1[0] + t * (p2[0] - p1[0])),
-                    int(p1[1] + t * (p2[1] - p1[1])),
-                    int(p1[2] + t * (p2[2] - p1[2])),
-                    int(p1[3] + t * (p2[3] - p1[3]))
-                )
-        
-        return (self.x, self.y, self.width, self.height)
+        return _interp_box(positions.frames, positions.boxes, positions.size, frame_num)
+
+
+class FFmpegWriter:
+    """cv2.VideoWriter-compatible sink that pipes raw BGR frames into an FFmpeg encoder"""
+    
+    def __init__(self, output_path: str, encoder: str, fps: float, size: Tuple[int, int]):
+        width, height = size
+        self.proc = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error",
+             "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps),
+             "-i", "-", "-c:v", encoder, *ENCODER_OPTIONS.get(encoder, ()),
+             "-pix_fmt", "yuv420p", output_path],
+            stdin=subprocess.PIPE)
+    
+    def write(self, frame: np.ndarray):
+        self.proc.stdin.write(np.ascontiguousarray(frame).data)
+    
+    def release(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = self.proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg encoding failed (exit code {returncode})")
+
+
+class FFmpegReader:
+    """cv2.VideoCapture-compatible source that reads raw BGR frames from an FFmpeg decoder using hwaccel"""
+    
+    def __init__(self, input_path: str, size: Tuple[int, int]):
+        width, height = size
+        self.shape = (height, width, 3)
+        # "fatal": a machine without a usable GPU logs a device-creation error before decoding in software
+        self.proc = subprocess.Popen(
+            ["ffmpeg", "-nostdin", "-loglevel", "fatal", "-hwaccel", "auto", "-i", input_path,
+             "-map", "0:v:0", "-vsync", "passthrough", "-f", "rawvideo", "-pix_fmt", "bgr24", "-"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE)
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        frame = np.empty(self.shape, np.uint8)
+        if self.proc.stdout.readinto(memoryview(frame).cast("B")) != frame.nbytes:
+            # A short read is only the end of the video if ffmpeg also exited cleanly
+            returncode = self.proc.wait()
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg decoding failed (exit code {returncode})")
+            return False, None
+        return True, frame
+    
+    def release(self):
+        if self.proc.poll() is None:
+            self.proc.terminate()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+class CudaCascadeClassifier:
+    """cv2.CascadeClassifier-compatible detectMultiScale on OpenCV's CUDA cascade, with a private stream"""
+    
+    def __init__(self, cascade_path: str):
+        self.cascade = cv2.cuda.CascadeClassifier_create(cascade_path)
+        self.stream = cv2.cuda_Stream()
+        self.gpu_image = cv2.cuda_GpuMat()
+    
+    def detectMultiScale(self, image: np.ndarray, scaleFactor: float, minNeighbors: int,
+                         minSize: Tuple[int, int]) -> List[Tuple[int, int, int, int]]:
+        self.cascade.setScaleFactor(scaleFactor)
+        self.cascade.setMinNeighbors(minNeighbors)
+        self.cascade.setMinObjectSize(minSize)
+        self.gpu_image.upload(image, self.stream)
+        objects = self.cascade.detectMultiScale(self.gpu_image, stream=self.stream)
+        self.stream.waitForCompletion()
+        return self.cascade.convert(objects)
+
+
+class LucasKanadeTracker:
+    """Tracker-compatible init/update that moves the box by the median pyramidal LK flow of its corners"""
+    
+    def __init__(self):
+        self.prev_gray: Optional[np.ndarray] = None
+        self.points: Optional[np.ndarray] = None
+        self.box = np.zeros(4)
+    
+    def init(self, frame: np.ndarray, bbox: Tuple[int, int, int, int]):
+        self.prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.box = np.array(bbox, dtype=np.float64)
+        self.points = self._corners(self.prev_gray)
+    
+    def _corners(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """Strong corners inside the current box, or None if it has left the frame"""
+        frame_h, frame_w = gray.shape
+        x, y, w, h = self.box
+        x1, y1 = max(int(x), 0), max(int(y), 0)
+        x2, y2 = min(int(x + w), frame_w), min(int(y + h), frame_h)
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return None
+        mask = np.zeros_like(gray)
+        mask[y1:y2, x1:x2] = 255
+        return cv2.goodFeaturesToTrack(gray, LK_MAX_CORNERS, 0.01, 5, mask=mask)
+    
+    def update(self, frame: np.ndarray) -> Tuple[bool, Tuple[int, int, int, int]]:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.points is None or len(self.points) < LK_MIN_CORNERS:
+            return False, tuple(int(v) for v in self.box)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None,
+                                                    winSize=(15, 15), maxLevel=2)
+        found = status.ravel() == 1
+        if np.count_nonzero(found) < LK_MIN_CORNERS:
+            return False, tuple(int(v) for v in self.box)
+        
+        self.box[:2] += np.median((moved - self.points)[found].reshape(-1, 2), axis=0)
+        self.prev_gray = gray
+        self.points = moved[found].reshape(-1, 1, 2)
+        if len(self.points) < LK_MAX_CORNERS // 2:
+            self.points = self._corners(gray)
+        return True, tuple(int(round(v)) for v in self.box)
+
+
+class CudaFlowTracker:
+    """Tracker-compatible init/update that moves the box by the median round-trip-consistent CUDA flow"""
+    
+    def __init__(self):
+        self.flow = cv2.cuda.FarnebackOpticalFlow_create()
+        self.stream = cv2.cuda_Stream()
+        self.gpu_prev = cv2.cuda_GpuMat()
+        self.gpu_next = cv2.cuda_GpuMat()
+        self.prev_gray: Optional[np.ndarray] = None
+        self.box = np.zeros(4)
+    
+    def init(self, frame: np.ndarray, bbox: Tuple[int, int, int, int]):
+        self.prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.box = np.array(bbox, dtype=np.float64)
+    
+    def update(self, frame: np.ndarray) -> Tuple[bool, Tuple[int, int, int, int]]:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        x, y, w, h = self.box
+        # Flow is only computed over the box plus a half-box margin on each side
+        frame_h, frame_w = gray.shape
+        x0, y0 = max(int(x - w / 2), 0), max(int(y - h / 2), 0)
+        x1, y1 = min(int(x + w * 1.5) + 1, frame_w), min(int(y + h * 1.5) + 1, frame_h)
+        bx0, by0 = max(int(x), x0) - x0, max(int(y), y0) - y0
+        bx1, by1 = min(int(x + w), x1) - x0, min(int(y + h), y1) - y0
+        if bx1 - bx0 < 2 or by1 - by0 < 2:
+            return False, tuple(int(v) for v in self.box)
+        
+        prev_roi, next_roi = self.prev_gray[y0:y1, x0:x1], gray[y0:y1, x0:x1]
+        self.gpu_prev.upload(np.ascontiguousarray(prev_roi), self.stream)
+        self.gpu_next.upload(np.ascontiguousarray(next_roi), self.stream)
+        gpu_forward = self.flow.calc(self.gpu_prev, self.gpu_next, None, self.stream)
+        gpu_backward = self.flow.calc(self.gpu_next, self.gpu_prev, None, self.stream)
+        self.stream.waitForCompletion()
+        forward, backward = gpu_forward.download(), gpu_backward.download()
+        
+        # Follow each box pixel's flow, then the backward flow from where it lands; drift and
+        # occlusion show up as pixels that do not come back
+        flow = forward[by0:by1, bx0:bx1]
+        ys, xs = np.mgrid[by0:by1, bx0:bx1]
+        tx = np.clip(np.rint(xs + flow[..., 0]).astype(np.intp), 0, forward.shape[1] - 1)
+        ty = np.clip(np.rint(ys + flow[..., 1]).astype(np.intp), 0, forward.shape[0] - 1)
+        round_trip = flow + backward[ty, tx]
+        consistent = np.hypot(round_trip[..., 0], round_trip[..., 1]) < FLOW_FB_MAX_ERROR
+        if np.count_nonzero(consistent) < FLOW_MIN_CONSISTENT * consistent.size:
+            return False, tuple(int(v) for v in self.box)
+        # Smooth flow can also round-trip across an occluder; check the content still matches
+        before = prev_roi[by0:by1, bx0:bx1].astype(np.float32).ravel()
+        after = next_roi[ty, tx].astype(np.float32).ravel()
+        if before.std() > 1 and (after.std() <= 1 or
+                                 np.corrcoef(before, after)[0, 1] < FLOW_MIN_CORRELATION):
+            return False, tuple(int(v) for v in self.box)
+        dx, dy = np.median(flow[consistent], axis=0)
+        
+        self.box[:2] += (dx, dy)
+        self.prev_gray = gray
+        return True, tuple(int(round(v)) for v in self.box)
+
+
+def probe_pipe_encoder() -> Optional[str]:
+    """First hardware H.264 encoder FFmpeg can actually open here, else libx264 if it opens, or None"""
+    if shutil.which("ffmpeg") is None:
+        return None
+    for encoder in HW_ENCODERS + (SOFTWARE_ENCODER,):
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi",
+                 "-i", "color=size=256x256:rate=1", "-frames:v", "1",
+                 "-c:v", encoder, "-f", "null", "-"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            return encoder
+    return None
+
+
+def save_regions(path: str, regions: List[BlurRegion]):
+    """Write regions to one compressed .npz: a column per field, tracks packed end to end"""
+    tracks = [r.tracked_positions for r in regions]
+    np.savez_compressed(
+        path,
+        geometry=np.array([(r.x, r.y, r.width, r.height) for r in regions], dtype=np.int64).reshape(-1, 4),
+        times=np.array([(r.start_time, r.end_time) for r in regions], dtype=np.float64).reshape(-1, 2),
+        blur=np.array([r.blur_strength for r in regions], dtype=np.int64),
+        mode=np.array([r.mode.value for r in regions], dtype=str),
+        track_id=np.array([-1 if r.track_id is None else r.track_id for r in regions], dtype=np.int64),
+        track_counts=np.array([t.size for t in tracks], dtype=np.int64),
+        track_frames=np.concatenate([t.frames[:t.size] for t in tracks] + [np.empty(0, np.int32)]),
+        track_boxes=np.concatenate([t.boxes[:t.size] for t in tracks] + [np.empty((0, 4), np.int32)]))
+
+
+def load_regions(path: str) -> List[BlurRegion]:
+    """Read regions written by save_regions"""
+    with np.load(path, allow_pickle=False) as data:
+        geometry, times, blur = data["geometry"].tolist(), data["times"].tolist(), data["blur"].tolist()
+        modes, track_ids = data["mode"].tolist(), data["track_id"].tolist()
+        bounds = np.concatenate(([0], np.cumsum(data["track_counts"]))).tolist()
+        frames, boxes = data["track_frames"], data["track_boxes"]
+    
+    regions = []
+    for i, (x, y, w, h) in enumerate(geometry):
+        region = BlurRegion(x=x, y=y, width=w, height=h, start_time=times[i][0], end_time=times[i][1],
+                            blur_strength=blur[i], mode=BlurMode(modes[i]),
+                            track_id=None if track_ids[i] < 0 else track_ids[i])
+        # Saved tracks are already frame-sorted, so they drop straight into the arrays
+        n = bounds[i + 1] - bounds[i]
+        if n:
+            positions = region.tracked_positions
+            positions.frames = frames[bounds[i]:bounds[i + 1]].astype(np.int32)
+            positions.boxes = boxes[bounds[i]:bounds[i + 1]].astype(np.int32)
+            positions.size = n
+        regions.append(region)
+    return regions
 
 
 class UltimateVideoBlurTool:
     def __init__(self, root: tk.Tk):
+        # Make sure OpenCV's SIMD code paths and worker threads are enabled
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(OPENCV_THREADS)
+        self._stats: Dict[str, float] = defaultdict(float)
+        # One long-lived thread runs face/plate detection and scans in the order they were asked for
+        self._detect_worker = ThreadPoolExecutor(max_workers=1)
+        # Playback renders preview frames here so blur and conversion run off the Tk thread
+        self._render_worker = ThreadPoolExecutor(max_workers=1)
+        self._render_busy = False  # a playback frame is being rendered; later ticks drop theirs
+        # Set when the window closes; worker jobs stop at their next check instead of holding up exit
+        self._closing = threading.Event()
+        
         self.root = root
         self.root.title("🎬 Video Blur Tool v3 - Ultimate Edition")
         self.root.geometry("1350x900")
@@ -85,15 +578,49 @@ class UltimateVideoBlurTool:
         self.video_width: int = 0
         self.video_height: int = 0
         self.duration: float = 0.0
+        # Index of the frame last decoded from self.cap; None when the decoder position is unknown
+        self._last_frame_idx: Optional[int] = -1
+        self._last_frame: Optional[np.ndarray] = None  # that frame, kept even if the LRU evicts it
+        self._frame_cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._frame_cache_size: int = FRAME_CACHE_MAX_FRAMES
+        self._frame_cache_lock = threading.Lock()  # shared with the playback prefetch thread
+        self._decode_lock = threading.Lock()
+        self._prefetch_stop: Optional[threading.Event] = None
+        self._playhead: int = 0
+        # Capture reused by forward tracking on the detect worker, opened on first use,
+        # and the frame it will decode next so a continuing track needs no seek
+        self._track_cap: Optional[cv2.VideoCapture] = None
+        self._track_cap_next = -1
+        self._track_cap_lock = threading.Lock()
         
         # Detection models
         self.face_cascade = None
+        self.face_cascade_path = None
         self.profile_cascade = None
+        self.face_net_path: Optional[str] = None
+        self.face_net = None  # detect-worker YuNet detector, created on first use
+        # ((video path, frame number), plate boxes) from the last plate detection, for repeat clicks
+        self._plate_cache: Optional[Tuple[Tuple[str, int], List[List[int]]]] = None
         self._load_detection_models()
         
+        # GPU acceleration for export and tracking
+        self.use_cuda = False
+        self._cuda_filters: Dict[int, object] = {}
+        self._cuda_buffers = None  # (stream, frame, scratch), created on first GPU export frame
+        try:
+            self.use_cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            pass
+        self.use_opencl = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+        self._pipe_encoder: Optional[str] = None
+        self._pipe_encoder_probed = False
+        self._export_exact_blur = False  # running export's opt-out of large-kernel approximations
+        
         # Blur regions
         self.blur_regions: List[BlurRegion] = []
         self.current_region_id: Optional[int] = None
+        self._region_schedule = self._build_region_schedule()  # rebuilt in _update_regions_list
+        self._schedule_dirty = False
         
         # Selection state
         self.is_selecting = False
@@ -105,10 +632,36 @@ class UltimateVideoBlurTool:
         self.scale_factor: float = 1.0
         self.canvas_offset_x: int = 0
         self.canvas_offset_y: int = 0
+        self._canvas_buf: Optional[np.ndarray] = None  # reused canvas-sized preview buffer
+        # Unblurred resized frame and its (frame, width, height): redraws that only change
+        # regions or blur settings start from a copy instead of a decode and resize
+        self._canvas_base: Optional[np.ndarray] = None
+        self._canvas_base_key: Optional[Tuple[int, int, int]] = None
+        self._ppm_buf: Optional[np.ndarray] = None  # PPM header + RGB pixels handed to Tk
+        self._ppm_rgb: Optional[np.ndarray] = None  # RGB view into _ppm_buf
+        # Held while the buffers above are filled, by the Tk thread or the render worker
+        self._render_lock = threading.Lock()
+        
+        # Persistent canvas items, updated in place on each redraw
+        self.photo: Optional[tk.PhotoImage] = None
+        self._image_item: Optional[int] = None
+        self._region_items: List[Tuple[int, List[int], int]] = []  # (rect, handles, label) per region
+        
+        # Cached canvas-space region coords; marked dirty when regions or the view change
+        self._canvas_coords = np.empty((0, 4), np.int32)
+        self._canvas_coords_dirty = True
+        self._canvas_coords_tracked = False
+        self._canvas_coords_frame = -1
+        self._canvas_view: Optional[Tuple[float, int, int]] = None
+        self._canvas_cursor = "crosshair"
         
         # Processing state
         self.is_processing = False
         self.preview_running = False
+        self._preview_after: Optional[str] = None
+        self._preview_due = 0.0
+        self._pending_seek: Optional[float] = None
+        self._seek_scheduled = False
         
         # === v1 Mouse-centric state ===
         self.dragging_region: Optional[int] = None
@@ -123,6 +676,7 @@ class UltimateVideoBlurTool:
         # === v2 Detection state ===
         self.auto_track_var = None
         self.sensitivity_var = None
+        self.detect_size_var = None
         
         # Blur presets
         self.blur_presets = {"Light": 21, "Medium": 51, "Heavy": 99, "Maximum": 151}
@@ -138,12 +692,30 @@ class UltimateVideoBlurTool:
         self._setup_styles()
         self._create_ui()
         self._create_context_menus()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+    def _on_close(self):
+        """Stop background jobs (executor threads are joined at exit) and close the window"""
+        self._closing.set()
+        self.preview_running = False
+        self._stop_prefetch()
+        self._detect_worker.shutdown(wait=False, **_SHUTDOWN_CANCEL)
+        self._render_worker.shutdown(wait=False, **_SHUTDOWN_CANCEL)
+        self.root.destroy()
         
     def _load_detection_models(self):
-        """Load face detection cascades"""
+        """Load face detection cascades, and find the YuNet model if present"""
+        if hasattr(cv2, 'FaceDetectorYN') and os.path.isfile(YUNET_MODEL_PATH):
+            try:
+                # Load once up front so a corrupt or incompatible model falls back here, not mid-scan
+                cv2.FaceDetectorYN.create(YUNET_MODEL_PATH, "", (320, 320))
+                self.face_net_path = YUNET_MODEL_PATH
+            except cv2.error as e:
+                print(f"Warning: Could not load YuNet model, using Haar cascades: {e}")
         try:
             cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
             self.face_cascade = cv2.CascadeClassifier(cascade_path)
+            self.face_cascade_path = cascade_path
             self.profile_cascade = cv2.CascadeClassifier(
                 cv2.data.haarcascades + 'haarcascade_profileface.xml'
             )
@@ -323,6 +895,16 @@ class UltimateVideoBlurTool:
         ttk.Scale(sens_frame, from_=1.05, to=1.5, variable=self.sensitivity_var,
                   orient=tk.HORIZONTAL).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
+        # Long side frames are shrunk to before detection; the far right end means full resolution
+        size_frame = ttk.Frame(detect_frame)
+        size_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(size_frame, text="Detect size:").pack(side=tk.LEFT)
+        self.detect_size_var = tk.IntVar(value=FACE_DETECT_MAX_SIDE)
+        self.detect_size_label = ttk.Label(size_frame, text=str(FACE_DETECT_MAX_SIDE), width=5)
+        ttk.Scale(size_frame, from_=320, to=FACE_DETECT_FULL_SIDE, variable=self.detect_size_var, orient=tk.HORIZONTAL,
+                  command=self._update_detect_size_label).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.detect_size_label.pack(side=tk.RIGHT)
+        
         # === QUICK PRESETS (from v1) ===
         presets_frame = ttk.LabelFrame(scrollable_frame, text="🎯 Quick Size Presets", padding=10)
         presets_frame.pack(fill=tk.X, pady=(0, 10), padx=5)
@@ -399,6 +981,11 @@ class UltimateVideoBlurTool:
         ttk.Button(region_btns, text="🔄 Re-track", command=self._retrack_region).pack(side=tk.LEFT, padx=2)
         ttk.Button(region_btns, text="🧹 Clear", command=self._clear_all_regions).pack(side=tk.RIGHT, padx=2)
         
+        file_btns = ttk.Frame(regions_frame)
+        file_btns.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(file_btns, text="💾 Save Regions", command=self._save_regions).pack(side=tk.LEFT, padx=2)
+        ttk.Button(file_btns, text="📂 Load Regions", command=self._load_regions).pack(side=tk.LEFT, padx=2)
+        
         # === EXPORT ===
         export_frame = ttk.LabelFrame(scrollable_frame, text="💾 Export", padding=10)
         export_frame.pack(fill=tk.X, pady=(0, 10), padx=5)
@@ -410,6 +997,10 @@ class UltimateVideoBlurTool:
         self.progress_label = ttk.Label(export_frame, text="Ready")
         self.progress_label.pack(fill=tk.X)
         
+        self.fast_blur_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(export_frame, text="⚡ Fast large blur (pyramid approximation)",
+                        variable=self.fast_blur_var).pack(anchor=tk.W, pady=(5, 0))
+        
         ttk.Button(export_frame, text="🚀 Export Blurred Video", style="Accent.TButton",
                    command=self._export_video).pack(fill=tk.X, pady=(10, 0))
         
@@ -455,42 +1046,21 @@ class UltimateVideoBlurTool:
         if self.cap is None:
             return None
         
-        current_frame = int(self.time_var.get() * self.fps)
+        current_frame = self._frame_at(self.time_var.get())
+        coords = self._region_canvas_coords(current_frame)
         
-        for i, region in enumerate(self.blur_regions):
-            if region.tracked_positions:
-                x, y, w, h = region.get_position_at_frame(current_frame)
-            else:
-                x, y, w, h = region.x, region.y, region.width, region.height
-            
-            # Convert region to canvas coordinates (v1 approach)
-            x1 = int(x * self.scale_factor) + self.canvas_offset_x
-            y1 = int(y * self.scale_factor) + self.canvas_offset_y
-            x2 = int((x + w) * self.scale_factor) + self.canvas_offset_x
-            y2 = int((y + h) * self.scale_factor) + self.canvas_offset_y
-            
-            if x1 <= canvas_x <= x2 and y1 <= canvas_y <= y2:
-                return i
-        return None
+        # Hit-test every region at once against the cached canvas boxes; first match wins
+        hits = np.flatnonzero((coords[:, 0] <= canvas_x) & (canvas_x <= coords[:, 2]) &
+                              (coords[:, 1] <= canvas_y) & (canvas_y <= coords[:, 3]))
+        return int(hits[0]) if hits.size else None
 
     def _get_resize_handle(self, canvas_x, canvas_y, region_idx) -> Optional[str]:
         """Check if mouse is on a resize handle (corners) of the region"""
         if self.cap is None or self.scale_factor == 0 or region_idx is None:
             return None
         
-        region = self.blur_regions[region_idx]
-        current_frame = int(self.time_var.get() * self.fps)
-        
-        if region.tracked_positions:
-            x, y, w, h = region.get_position_at_frame(current_frame)
-        else:
-            x, y, w, h = region.x, region.y, region.width, region.height
-        
-        # Convert to canvas coordinates
-        cx1 = int(x * self.scale_factor) + self.canvas_offset_x
-        cy1 = int(y * self.scale_factor) + self.canvas_offset_y
-        cx2 = int((x + w) * self.scale_factor) + self.canvas_offset_x
-        cy2 = int((y + h) * self.scale_factor) + self.canvas_offset_y
+        current_frame = self._frame_at(self.time_var.get())
+        cx1, cy1, cx2, cy2 = self._region_canvas_coords(current_frame)[region_idx].tolist()
         
         handle_size = 12  # pixels
         
@@ -518,7 +1088,7 @@ class UltimateVideoBlurTool:
             return
             
         self.video_path = file_path
-        self.cap = cv2.VideoCapture(file_path)
+        self.cap = self._open_capture(file_path)
         
         if not self.cap.isOpened():
             messagebox.showerror("Error", "Could not open video file")
@@ -529,6 +1099,17 @@ class UltimateVideoBlurTool:
         self.video_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.video_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.duration = self.total_frames / self.fps
+        self._last_frame_idx = -1
+        self._last_frame = None
+        self._canvas_base_key = None
+        self._plate_cache = None  # the same path may now hold a different file
+        # Queued behind any running track, so the Tk thread never waits on _track_cap_lock
+        self._detect_worker.submit(self._release_track_cap)
+        self._stop_prefetch()
+        with self._frame_cache_lock:
+            self._frame_cache.clear()
+        frame_bytes = max(1, self.video_width * self.video_height * 3)
+        self._frame_cache_size = max(1, min(FRAME_CACHE_MAX_FRAMES, FRAME_CACHE_MAX_BYTES // frame_bytes))
         
         self.file_label.config(text=f"📄 {Path(file_path).name}\n"
                                     f"📐 {self.video_width}x{self.video_height} | "
@@ -536,39 +1117,190 @@ class UltimateVideoBlurTool:
         
         self.timeline_slider.config(to=self.duration)
         self.end_time_var.set(f"{self.duration:.2f}")
-        self.status_label.config(text="✅ Video loaded")
+        # VIDEO_ACCELERATION_ANY silently falls back to software, so report what was negotiated
+        hw_decode = self.cap.get(getattr(cv2, 'CAP_PROP_HW_ACCELERATION', -1)) > 0
+        self.status_label.config(text=f"✅ Video loaded ({self.cap.getBackendName()}, "
+                                      f"{'hardware' if hw_decode else 'software'} decode)")
         
         self._clear_all_regions()
         self._show_frame(0)
 
+    def _open_capture(self, path: str) -> cv2.VideoCapture:
+        """Open a capture on the FFmpeg backend with hardware decoding if available"""
+        try:
+            cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG,
+                                   [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+            if cap.isOpened():
+                return cap
+        except (AttributeError, cv2.error):
+            pass
+        return cv2.VideoCapture(path)
+
+    def _frame_at(self, time_seconds: float) -> int:
+        """Index of the frame shown at a time; frame k spans [k / fps, (k + 1) / fps)"""
+        # Round off float error first: (k / fps) * fps can land just below k
+        return int(round(time_seconds * self.fps, 6))
+
+    def _frame_time(self, time_seconds: float) -> float:
+        """Start time of the frame shown at a time, which is what the export tests regions at"""
+        return self._frame_at(time_seconds) / self.fps
+
     def _get_current_frame(self) -> Optional[np.ndarray]:
         """Get the current frame without blur applied"""
         if self.cap is None:
             return None
-        current_time = self.time_var.get()
-        frame_number = int(current_time * self.fps)
+        frame_number = self._frame_at(self.time_var.get())
         frame_number = max(0, min(frame_number, self.total_frames - 1))
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = self.cap.read()
-        return frame if ret else None
+        return self._read_frame(frame_number)
+
+    def _read_frame(self, frame_number: int) -> Optional[np.ndarray]:
+        """Fetch a raw BGR frame from the LRU cache, decoding it on a miss"""
+        with self._frame_cache_lock:
+            frame = self._frame_cache.get(frame_number)
+            if frame is not None:
+                self._frame_cache.move_to_end(frame_number)
+                return frame
+        
+        # The preview capture is shared by the Tk thread and the render worker
+        with self._decode_lock:
+            frame = self._decode_frame(frame_number)
+        if frame is not None:
+            self._cache_frame(frame_number, frame)
+        return frame
+
+    def _cache_frame(self, frame_number: int, frame: np.ndarray, stop: Optional[threading.Event] = None):
+        with self._frame_cache_lock:
+            # Checked under the lock so a stopped prefetch can't refill a just-cleared cache
+            if stop is not None and stop.is_set():
+                return
+            self._frame_cache[frame_number] = frame
+            while len(self._frame_cache) > self._frame_cache_size:
+                self._frame_cache.popitem(last=False)
+
+    def _start_prefetch(self, frame_number: int):
+        """Decode ahead of the playhead on a private capture while the preview plays"""
+        self._stop_prefetch()
+        self._playhead = frame_number
+        self._prefetch_stop = threading.Event()
+        threading.Thread(target=self._prefetch_loop, args=(self.video_path, frame_number, self._prefetch_stop),
+                         daemon=True).start()
+
+    def _stop_prefetch(self):
+        if self._prefetch_stop is not None:
+            self._prefetch_stop.set()
+            self._prefetch_stop = None
+
+    def _prefetch_loop(self, path: str, frame_number: int, stop: threading.Event):
+        cap = self._open_capture(path)
+        try:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            ahead = max(1, min(PREFETCH_AHEAD_FRAMES, self._frame_cache_size // 2))
+            while not stop.is_set():
+                playhead = self._playhead
+                if frame_number < playhead:
+                    # Playback overtook us (or jumped); skip forward without converting frames
+                    if playhead - frame_number > 2 * self.fps:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, playhead)
+                    else:
+                        for _ in range(playhead - frame_number):
+                            cap.grab()
+                    frame_number = playhead
+                if frame_number - playhead >= ahead:
+                    stop.wait(1 / self.fps)
+                    continue
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self._cache_frame(frame_number, frame, stop)
+                frame_number += 1
+        finally:
+            cap.release()
+
+    def _decode_frame(self, frame_number: int) -> Optional[np.ndarray]:
+        """Decode a frame, skipping forward with grab() instead of seeking when close"""
+        if self._last_frame_idx is None:
+            # After a failed read the capture may sit at EOF; only a seek is reliable
+            gap = None
+        else:
+            gap = frame_number - self._last_frame_idx
+        if gap == 0 and self._last_frame is not None:
+            # Prefetch can evict the frame we are parked on; re-reading it would cost a seek
+            return self._last_frame
+        with self._tick("read"):
+            if gap is not None and 0 < gap <= 2 * self.fps:
+                # grab() advances the decoder without the YUV->BGR conversion
+                for _ in range(gap - 1):
+                    if not self.cap.grab():
+                        self._last_frame_idx = None
+                        self._last_frame = None
+                        return None
+                ret = self.cap.grab()
+                frame = self.cap.retrieve()[1] if ret else None
+            elif gap is not None and -2 * self.fps <= gap < 0:
+                # The seek decodes from the keyframe anyway; keep the frames leading up to this one
+                fill = min(BACKSTEP_FILL_FRAMES, self._frame_cache_size // 2)
+                first = max(0, frame_number - fill)
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+                for earlier in range(first, frame_number):
+                    ret, frame = self.cap.read()
+                    if not ret:
+                        break
+                    self._cache_frame(earlier, frame)
+                else:
+                    ret, frame = self.cap.read()
+            else:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ret, frame = self.cap.read()
+        
+        self._last_frame_idx = frame_number if ret else None
+        self._last_frame = frame if ret else None
+        return self._last_frame
 
     def _show_frame(self, time_seconds: float):
         """Display a frame at the given time"""
         if self.cap is None:
             return
-            
-        frame_number = int(time_seconds * self.fps)
-        frame_number = max(0, min(frame_number, self.total_frames - 1))
-        
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = self.cap.read()
-        
-        if not ret:
+        frame_number, new_width, new_height = self._preview_layout(time_seconds)
+        # Judge regions at the frame's own time so the preview matches what the export writes
+        time_seconds = frame_number / self.fps
+        with self._render_lock:
+            ppm = self._render_preview(time_seconds, frame_number, new_width, new_height,
+                                       self.scale_factor, self._current_schedule())
+        if ppm is not None:
+            self._present_frame(ppm, time_seconds, frame_number)
+
+    def _render_playback_frame(self, time_seconds: float):
+        """Render a playback frame on the render worker; dropped if the previous one is unfinished"""
+        if self._render_busy:
             return
+        self._render_busy = True
+        frame_number, new_width, new_height = self._preview_layout(time_seconds)
+        time_seconds = frame_number / self.fps
+        self._render_worker.submit(self._render_job, time_seconds, frame_number, new_width, new_height,
+                                   self.scale_factor, self._current_schedule())
+
+    def _render_job(self, time_seconds: float, frame_number: int, width: int, height: int,
+                    scale: float, schedule):
+        ppm = None
+        try:
+            with self._render_lock:
+                ppm = self._render_preview(time_seconds, frame_number, width, height, scale, schedule)
+        finally:
+            self.root.after(0, self._present_playback_frame, ppm, time_seconds, frame_number)
+
+    def _present_playback_frame(self, ppm: Optional[bytes], time_seconds: float, frame_number: int):
+        self._render_busy = False
+        if not self.preview_running:
+            # Paused (or seeked) while this frame rendered; show where the timeline is now instead
+            self._request_frame(self.time_var.get())
+        elif ppm is not None:
+            self._present_frame(ppm, time_seconds, frame_number)
+
+    def _preview_layout(self, time_seconds: float) -> Tuple[int, int, int]:
+        """Frame number and canvas-fitted size for a time; updates the canvas scale and offsets"""
+        frame_number = self._frame_at(time_seconds)
+        frame_number = max(0, min(frame_number, self.total_frames - 1))
             
-        frame = self._apply_blur_regions(frame, time_seconds, frame_number)
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
@@ -584,80 +1316,378 @@ class UltimateVideoBlurTool:
         
         self.canvas_offset_x = (canvas_width - new_width) // 2
         self.canvas_offset_y = (canvas_height - new_height) // 2
+        view = (self.scale_factor, self.canvas_offset_x, self.canvas_offset_y)
+        if view != self._canvas_view:
+            self._canvas_view = view
+            self._canvas_coords_dirty = True
+        return frame_number, new_width, new_height
+
+    def _render_preview(self, time_seconds: float, frame_number: int, new_width: int, new_height: int,
+                        scale: float, schedule) -> Optional[bytes]:
+        """Blurred preview frame as binary PPM bytes; the caller holds _render_lock"""
+        # Resize first so blur and colour conversion only touch canvas-sized pixels
+        base_key = (frame_number, new_width, new_height)
+        if base_key != self._canvas_base_key:
+            frame = self._read_frame(frame_number)
+            if frame is None:
+                return None
+            if self._canvas_base is None or self._canvas_base.shape[:2] != (new_height, new_width):
+                self._canvas_base = np.empty((new_height, new_width, 3), np.uint8)
+            with self._tick("resize"):
+                cv2.resize(frame, (new_width, new_height), dst=self._canvas_base)
+            self._canvas_base_key = base_key
+        
+        if self._canvas_buf is None or self._canvas_buf.shape[:2] != (new_height, new_width):
+            self._canvas_buf = np.empty((new_height, new_width, 3), np.uint8)
+            # Binary PPM for Tk: fixed header followed by RGB pixels written in place each frame
+            header = f"P6 {new_width} {new_height} 255 ".encode()
+            self._ppm_buf = np.empty(len(header) + new_width * new_height * 3, np.uint8)
+            self._ppm_buf[:len(header)] = np.frombuffer(header, np.uint8)
+            self._ppm_rgb = self._ppm_buf[len(header):].reshape(new_height, new_width, 3)
+        frame = self._canvas_buf
+        np.copyto(frame, self._canvas_base)
+        frame = self._apply_blur_regions(frame, time_seconds, frame_number, scale=scale,
+                                         inplace=True, preview=True, schedule=schedule)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._ppm_rgb)
+        return self._ppm_buf.tobytes()
+
+    def _present_frame(self, ppm: bytes, time_seconds: float, frame_number: int):
+        """Put a rendered frame and its region outlines on the canvas (Tk thread only)"""
+        # Hand Tk the pixels as a binary PPM, reloading one persistent PhotoImage
+        if self.photo is None:
+            self.photo = tk.PhotoImage(data=ppm, format="PPM")
+        else:
+            self.photo.configure(data=ppm, format="PPM")
         
-        frame = cv2.resize(frame, (new_width, new_height))
-        
-        from PIL import Image, ImageTk
-        image = Image.fromarray(frame)
-        self.photo = ImageTk.PhotoImage(image)
-        
-        self.canvas.delete("all")
-        self.canvas.create_image(self.canvas_offset_x, self.canvas_offset_y,
-                                 anchor=tk.NW, image=self.photo)
+        if self._image_item is None:
+            self._image_item = self.canvas.create_image(self.canvas_offset_x, self.canvas_offset_y,
+                                                        anchor=tk.NW, image=self.photo)
+        else:
+            self.canvas.coords(self._image_item, self.canvas_offset_x, self.canvas_offset_y)
         
         self._draw_blur_regions(time_seconds, frame_number)
         
         self.time_label.config(text=f"{self._format_time(time_seconds)} / {self._format_time(self.duration)}")
         self.frame_label.config(text=f"Frame: {frame_number} / {self.total_frames}")
 
-    def _apply_blur_regions(self, frame: np.ndarray, current_time: float, frame_number: int) -> np.ndarray:
-        """Apply blur to frame based on active regions"""
-        result = frame.copy()
-        
-        for region in self.blur_regions:
-            if region.contains_frame(current_time):
-                if region.tracked_positions:
-                    x, y, w, h = region.get_position_at_frame(frame_number)
-                else:
-                    x, y, w, h = region.x, region.y, region.width, region.height
-                    
-                x1, y1 = max(0, x), max(0, y)
-                x2 = min(frame.shape[1], x + w)
-                y2 = min(frame.shape[0], y + h)
-                
-                if x2 > x1 and y2 > y1:
-                    roi = result[y1:y2, x1:x2]
-                    blur_size = region.blur_strength
-                    if blur_size % 2 == 0:
-                        blur_size += 1
-                    blurred = cv2.GaussianBlur(roi, (blur_size, blur_size), 0)
-                    result[y1:y2, x1:x2] = blurred
-                    
+    def _active_region_rects(self, current_time: float, frame_number: int, shape: Tuple[int, ...],
+                             scale: float = 1.0, schedule=None,
+                             active: Optional[np.ndarray] = None) -> List[Tuple[int, int, int, int, int]]:
+        """Clamped (x1, y1, x2, y2, ksize) per active region, computed column-wise from the schedule"""
+        if schedule is None:
+            schedule = self._current_schedule()
+        if active is None:
+            active = self._active_indices(schedule, current_time)
+        if not active.size:
+            return []
+        regions, _, _, _, geometry, tracked = schedule
+        
+        boxes = geometry[active]
+        for j in np.flatnonzero(tracked[active]):
+            boxes[j, :4] = regions[active[j]].get_position_at_frame(frame_number)
+        if scale != 1.0:
+            boxes = (boxes * scale).astype(np.int64)
+            boxes[:, 4] = np.maximum(boxes[:, 4], 1) | 1
+        
+        x1 = np.maximum(boxes[:, 0], 0)
+        y1 = np.maximum(boxes[:, 1], 0)
+        x2 = np.minimum(boxes[:, 0] + boxes[:, 2], shape[1])
+        y2 = np.minimum(boxes[:, 1] + boxes[:, 3], shape[0])
+        keep = (x2 > x1) & (y2 > y1)
+        rects = np.stack((x1, y1, x2, y2, boxes[:, 4]), axis=1)[keep]
+        return [tuple(r) for r in rects.tolist()]
+
+    def _apply_blur_regions(self, frame: np.ndarray, current_time: float, frame_number: int,
+                            scale: float = 1.0, inplace: bool = False, preview: bool = False,
+                            schedule=None, active: Optional[np.ndarray] = None,
+                            scratch: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply blur to frame based on active regions (scale maps video coords onto frame)"""
+        rects = self._active_region_rects(current_time, frame_number, frame.shape, scale, schedule, active)
+        if not rects:
+            return frame
+        result = frame if inplace else frame.copy()
+        
+        if preview and HAS_NUMBA and len(rects) >= NUMBA_MIN_REGIONS:
+            # Grouped like the normal path; blurs read the untouched frame, weakest pasted first
+            jobs = sorted(self._blur_jobs(rects), key=lambda job: job[4])
+            rect_array = np.array([job[:4] for job in jobs], dtype=np.int64)
+            boxes = np.array([_box_width(job[4]) for job in jobs], dtype=np.int64)
+            members = np.array([(*m[:4], i) for i, job in enumerate(jobs) for m in job[5]], dtype=np.int64)
+            src = frame if result is not frame or self._jobs_disjoint(jobs) else frame.copy()
+            _box_blur_regions_njit(src, result, rect_array, boxes, members)
+            return result
+        
+        if preview and self._luma_blur_worthwhile(rects, result.shape):
+            return self._apply_luma_blur(result, rects)
+        
+        jobs = self._blur_jobs(rects)
+        # Disjoint jobs blur straight into the caller's frame-sized scratch buffer
+        if scratch is not None and not self._jobs_disjoint(jobs):
+            scratch = None
+        
+        blurred = []
+        for x1, y1, x2, y2, blur_size, _ in jobs:
+            dst = None if scratch is None else scratch[y1:y2, x1:x2]
+            blurred.append(self._blur_roi(result[y1:y2, x1:x2], blur_size, preview, dst))
+        self._paste_blurred(result, jobs, blurred)
         return result
 
-    def _draw_blur_regions(self, current_time: float, frame_number: int):
-        """Draw blur region rectangles on canvas with resize handles"""
-        for i, region in enumerate(self.blur_regions):
-            if region.tracked_positions:
-                x, y, w, h = region.get_position_at_frame(frame_number)
-            else:
-                x, y, w, h = region.x, region.y, region.width, region.height
-                
-            x1 = int(x * self.scale_factor) + self.canvas_offset_x
-            y1 = int(y * self.scale_factor) + self.canvas_offset_y
-            x2 = int((x + w) * self.scale_factor) + self.canvas_offset_x
-            y2 = int((y + h) * self.scale_factor) + self.canvas_offset_y
+    def _blur_jobs(self, rects: List[Tuple[int, int, int, int, int]]) -> List[tuple]:
+        """(x1, y1, x2, y2, ksize, member rects) per blur; every backend reads all jobs before pasting"""
+        groups: Dict[int, List[Tuple[int, int, int, int, int]]] = {}
+        for rect in rects:
+            groups.setdefault(rect[4], []).append(rect)
+        
+        jobs = []
+        for blur_size, group in groups.items():
+            bx1, by1 = min(r[0] for r in group), min(r[1] for r in group)
+            bx2, by2 = max(r[2] for r in group), max(r[3] for r in group)
+            covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2, _ in group)
+            if len(group) == 1 or (bx2 - bx1) * (by2 - by1) > GROUP_BLUR_MAX_OVERDRAW * covered:
+                jobs.extend((*rect, [rect]) for rect in group)
+                continue
             
-            if region.contains_frame(current_time):
+            # Dense or overlapping regions with one strength: blur their bounding box once
+            jobs.append((bx1, by1, bx2, by2, blur_size, group))
+        return jobs
+
+    def _paste_blurred(self, result: np.ndarray, jobs: List[tuple], blurred: List[np.ndarray]):
+        """Paste each job's blurred pixels over its member rects"""
+        # Weakest first so the strongest blur wins where regions overlap
+        for (x1, y1, _, _, _, members), roi in sorted(zip(jobs, blurred), key=lambda jb: jb[0][4]):
+            for mx1, my1, mx2, my2, _ in members:
+                result[my1:my2, mx1:mx2] = roi[my1 - y1:my2 - y1, mx1 - x1:mx2 - x1]
+
+    def _luma_blur_worthwhile(self, rects: List[Tuple[int, int, int, int, int]],
+                              shape: Tuple[int, ...]) -> bool:
+        """Whether regions cover enough of an I420-compatible (even-sized) frame to blur luma only"""
+        h, w = shape[:2]
+        if h % 2 or w % 2:
+            return False
+        covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2, _ in rects)
+        return covered >= PREVIEW_LUMA_MIN_COVERAGE * h * w
+
+    def _apply_luma_blur(self, frame: np.ndarray, rects: List[Tuple[int, int, int, int, int]]) -> np.ndarray:
+        """Preview blur on the Y plane of an I420 copy; chroma is left as is"""
+        h = frame.shape[0]
+        with self._tick("luma"):
+            yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+            luma = yuv[:h]
+            for x1, y1, x2, y2, blur_size in rects:
+                luma[y1:y2, x1:x2] = self._blur_roi(luma[y1:y2, x1:x2], blur_size, preview=True)
+            # Copy back only the regions so untouched pixels keep full-resolution chroma
+            bgr = cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420)
+            for x1, y1, x2, y2, _ in rects:
+                frame[y1:y2, x1:x2] = bgr[y1:y2, x1:x2]
+        return frame
+
+    def _jobs_disjoint(self, jobs) -> bool:
+        """Whether no two blur jobs overlap, so they can share one scratch buffer"""
+        for i, (ax1, ay1, ax2, ay2, *_) in enumerate(jobs):
+            for bx1, by1, bx2, by2, *_ in jobs[i + 1:]:
+                if ax1 < bx2 and bx1 < ax2 and ay1 < by2 and by1 < ay2:
+                    return False
+        return True
+
+    def _apply_blur_regions_cuda(self, frame: np.ndarray, current_time: float, frame_number: int,
+                                 schedule=None, active: Optional[np.ndarray] = None) -> np.ndarray:
+        """Export-time blur on the GPU, grouped and composited like the CPU path"""
+        rects = self._active_region_rects(current_time, frame_number, frame.shape,
+                                          schedule=schedule, active=active)
+        if not rects:
+            return frame
+        
+        # Device buffers and the stream persist across frames; upload only reallocates on resize
+        if self._cuda_buffers is None:
+            self._cuda_buffers = (cv2.cuda_Stream(), cv2.cuda_GpuMat(), cv2.cuda_GpuMat())
+        stream, gpu_frame, gpu_scratch = self._cuda_buffers
+        gpu_frame.upload(frame, stream)
+        jobs = self._blur_jobs(rects)
+        # Disjoint jobs blur into one frame-sized scratch; overlapping ones each need their own output
+        shared = self._jobs_disjoint(jobs)
+        if shared and gpu_scratch.size() != gpu_frame.size():
+            gpu_scratch.create(gpu_frame.size(), gpu_frame.type())
+        
+        # Every job reads the untouched frame, on the GPU or, for kernels the CUDA filter can't
+        # build (too large), on the CPU while the GPU works; results are pasted strongest last
+        blurred: List[Optional[np.ndarray]] = [None] * len(jobs)
+        gpu_outputs = []
+        for i, (x1, y1, x2, y2, blur_size, _) in enumerate(jobs):
+            gaussian = self._get_cuda_filter(blur_size)
+            if gaussian is None:
+                continue
+            rect = (x1, y1, x2 - x1, y2 - y1)
+            out = cv2.cuda_GpuMat(gpu_scratch, rect) if shared else cv2.cuda_GpuMat()
+            gaussian.apply(cv2.cuda_GpuMat(gpu_frame, rect), out, stream)
+            gpu_outputs.append((i, out))
+        for i, (x1, y1, x2, y2, blur_size, _) in enumerate(jobs):
+            if self._get_cuda_filter(blur_size) is None:
+                blurred[i] = self._blur_roi(frame[y1:y2, x1:x2], blur_size)
+        for i, out in gpu_outputs:
+            blurred[i] = out.download(stream)
+        stream.waitForCompletion()
+        
+        self._paste_blurred(frame, jobs, blurred)
+        return frame
+
+    def _apply_blur_regions_ocl(self, frame: np.ndarray, current_time: float, frame_number: int,
+                                schedule=None, active: Optional[np.ndarray] = None) -> np.ndarray:
+        """Export-time blur through OpenCL (T-API), grouped and composited like the CPU path"""
+        rects = self._active_region_rects(current_time, frame_number, frame.shape,
+                                          schedule=schedule, active=active)
+        if not rects:
+            return frame
+        
+        # Each job uploads only its own pixels as a standalone UMat, so nothing outside it is
+        # sampled, and every job reads the untouched frame before any is pasted
+        jobs = self._blur_jobs(rects)
+        blurred = []
+        for x1, y1, x2, y2, blur_size, _ in jobs:
+            roi = frame[y1:y2, x1:x2]
+            blurred.append(self._export_blur(cv2.UMat(roi), blur_size, roi.shape).get())
+        self._paste_blurred(frame, jobs, blurred)
+        return frame
+
+    def _get_cuda_filter(self, ksize: int):
+        """Cached CUDA Gaussian filter for a kernel size, or None if CUDA rejects it"""
+        if ksize not in self._cuda_filters:
+            try:
+                self._cuda_filters[ksize] = cv2.cuda.createGaussianFilter(
+                    cv2.CV_8UC3, cv2.CV_8UC3, (ksize, ksize), 0)
+            except cv2.error:
+                self._cuda_filters[ksize] = None
+        return self._cuda_filters[ksize]
+
+    def _blur_roi(self, roi: np.ndarray, ksize: int, preview: bool = False,
+                  dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Blur a region; the preview trades the exact Gaussian for cheaper approximations"""
+        if not preview:
+            return self._export_blur(roi, ksize, roi.shape, dst)
+        
+        h, w = roi.shape[:2]
+        factor = PREVIEW_BLUR_DOWNSCALE
+        if ksize >= 4 * factor and min(w, h) >= 4 * factor:
+            # Large kernels: blur a downscaled copy, the difference is invisible on screen
+            small = cv2.resize(roi, (w // factor, h // factor), interpolation=cv2.INTER_AREA)
+            small = self._fast_blur(small, max(3, (ksize // factor) | 1))
+            return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+        return self._fast_blur(roi, ksize)
+
+    def _export_blur(self, roi, ksize: int, shape: Tuple[int, ...], dst: Optional[np.ndarray] = None):
+        """Export blur of an ndarray or standalone UMat region; large kernels follow the exact-blur setting"""
+        with self._tick("blur"):
+            if ksize < EXPORT_SEPARABLE_MIN_KSIZE:
+                return cv2.GaussianBlur(roi, (ksize, ksize), 0, dst=dst)
+            if ksize <= EXPORT_GAUSSIAN_MAX_KSIZE or self._export_exact_blur:
+                kernel = _gaussian_kernel(ksize)
+                return cv2.sepFilter2D(roi, -1, kernel, kernel, dst=dst)
+            levels = self._pyramid_levels(ksize, shape)
+            if levels:
+                return self._pyramid_blur(roi, ksize, levels, shape)
+            return self._fast_blur(roi, ksize, dst)
+
+    def _pyramid_levels(self, ksize: int, shape: Tuple[int, ...]) -> int:
+        """pyrDown levels for a large export kernel, keeping at least 9 taps and 8 pixels per side"""
+        if ksize < EXPORT_PYRAMID_MIN_KSIZE:
+            return 0
+        levels = min(3, int(np.log2(ksize / 9)))
+        while levels and min(shape[:2]) >> levels < 8:
+            levels -= 1
+        return levels
+
+    def _pyramid_blur(self, roi, ksize: int, levels: int, shape: Tuple[int, ...]):
+        """Gaussian blur on a downsampled pyramid level; pyrDown/pyrUp add their own smoothing"""
+        # Sizes come from shape rather than the image so a UMat region works too
+        h, w = shape[:2]
+        sizes = []
+        small = roi
+        for _ in range(levels):
+            sizes.append((w, h))
+            small = cv2.pyrDown(small)
+            w, h = (w + 1) // 2, (h + 1) // 2
+        k = max(3, (ksize >> levels) | 1)
+        small = cv2.GaussianBlur(small, (k, k), 0)
+        for size in reversed(sizes):
+            small = cv2.pyrUp(small, dstsize=size)
+        return small
+
+    def _fast_blur(self, roi: np.ndarray, ksize: int, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Constant-time-per-pixel Gaussian approximation for previews and large export kernels"""
+        if hasattr(cv2, 'stackBlur'):
+            # stackBlur mis-writes into strided (ROI) destinations, so it always allocates
+            return cv2.stackBlur(roi, (ksize, ksize))
+        # Three box passes approximate a Gaussian with the same sigma
+        box = _box_width(ksize)
+        out = cv2.blur(roi, (box, box), dst=dst)
+        cv2.blur(out, (box, box), dst=out)
+        cv2.blur(out, (box, box), dst=out)
+        return out
+
+    def _draw_blur_regions(self, current_time: float, frame_number: int):
+        """Draw blur region rectangles on canvas with resize handles, reusing existing items"""
+        handle_size = 6
+        icon = {"face": "👤", "plate": "🚗", "track": "🎯", "manual": "🔲"}
+        active = {id(r) for r in self._regions_active_at(self._current_schedule(), current_time)}
+        coords = self._region_canvas_coords(frame_number).tolist()
+        
+        for i, (region, (x1, y1, x2, y2)) in enumerate(zip(self.blur_regions, coords)):
+            if id(region) in active:
                 color = "#3fb950"
             else:
                 color = "#6e7681"
-                
-            self.canvas.create_rectangle(x1, y1, x2, y2, outline=color, width=2)
             
-            # Draw resize handles at corners
-            handle_size = 6
-            for hx, hy in [(x1, y1), (x2, y1), (x1, y2), (x2, y2)]:
-                self.canvas.create_rectangle(
-                    hx - handle_size, hy - handle_size,
-                    hx + handle_size, hy + handle_size,
-                    fill=color, outline="white", width=1)
-            
-            icon = {"face": "👤", "plate": "🚗", "track": "🎯", "manual": "🔲"}
+            corners = [(x1, y1), (x2, y1), (x1, y2), (x2, y2)]
             label = f"#{i+1} {icon.get(region.mode.value, '🔲')}"
             tracked = "📍" if region.tracked_positions else ""
-            self.canvas.create_text(x1 + 5, y1 + 15, text=f"{label}{tracked}",
-                                   fill=color, anchor=tk.NW, font=("Segoe UI", 9, "bold"))
+            
+            if i < len(self._region_items):
+                rect_id, handle_ids, text_id = self._region_items[i]
+                self.canvas.coords(rect_id, x1, y1, x2, y2)
+                self.canvas.itemconfig(rect_id, outline=color)
+                for handle_id, (hx, hy) in zip(handle_ids, corners):
+                    self.canvas.coords(handle_id, hx - handle_size, hy - handle_size,
+                                       hx + handle_size, hy + handle_size)
+                    self.canvas.itemconfig(handle_id, fill=color)
+                self.canvas.coords(text_id, x1 + 5, y1 + 15)
+                self.canvas.itemconfig(text_id, text=f"{label}{tracked}", fill=color)
+                continue
+            
+            rect_id = self.canvas.create_rectangle(x1, y1, x2, y2, outline=color, width=2)
+            
+            # Resize handles at corners
+            handle_ids = [self.canvas.create_rectangle(
+                              hx - handle_size, hy - handle_size,
+                              hx + handle_size, hy + handle_size,
+                              fill=color, outline="white", width=1)
+                          for hx, hy in corners]
+            
+            text_id = self.canvas.create_text(x1 + 5, y1 + 15, text=f"{label}{tracked}",
+                                              fill=color, anchor=tk.NW, font=("Segoe UI", 9, "bold"))
+            self._region_items.append((rect_id, handle_ids, text_id))
+        
+        # Drop items left over from deleted regions
+        for rect_id, handle_ids, text_id in self._region_items[len(self.blur_regions):]:
+            self.canvas.delete(rect_id, *handle_ids, text_id)
+        del self._region_items[len(self.blur_regions):]
+
+    def _region_canvas_coords(self, frame_number: int) -> np.ndarray:
+        """Canvas-space (x1, y1, x2, y2) per region, recomputed only when regions or the view change"""
+        stale = self._canvas_coords_dirty or len(self._canvas_coords) != len(self.blur_regions)
+        if not stale and not (self._canvas_coords_tracked and frame_number != self._canvas_coords_frame):
+            return self._canvas_coords
+        
+        boxes = np.array([r.get_position_at_frame(frame_number) if r.tracked_positions
+                          else (r.x, r.y, r.width, r.height) for r in self.blur_regions],
+                         dtype=np.float64).reshape(-1, 4)
+        boxes[:, 2:] += boxes[:, :2]
+        boxes *= self.scale_factor
+        boxes += (self.canvas_offset_x, self.canvas_offset_y) * 2
+        
+        self._canvas_coords = boxes.astype(np.int32)
+        self._canvas_coords_tracked = any(r.tracked_positions for r in self.blur_regions)
+        self._canvas_coords_frame = frame_number
+        self._canvas_coords_dirty = False
+        return self._canvas_coords
 
     # ==================== MOUSE EVENT HANDLERS (from v1) ====================
     
@@ -683,8 +1713,6 @@ class UltimateVideoBlurTool:
                 start_time, end_time = 0.0, self.duration
             
             blur_strength = self.blur_var.get()
-            if blur_strength % 2 == 0:
-                blur_strength += 1
             
             region = BlurRegion(x=video_x, y=video_y, width=w, height=h,
                 start_time=start_time, end_time=end_time, blur_strength=blur_strength)
@@ -694,7 +1722,7 @@ class UltimateVideoBlurTool:
             self._show_quick_toolbar(event.x_root, event.y_root, len(self.blur_regions) - 1)
             
             self.preset_size = None
-            self.canvas.config(cursor="crosshair")
+            self._set_cursor("crosshair")
             return
         
         # Check if clicking on existing region
@@ -781,7 +1809,9 @@ class UltimateVideoBlurTool:
                 
                 region.x, region.y = new_x, new_y
             
-            self._show_frame(self.time_var.get())
+            self._canvas_coords_dirty = True
+            self._schedule_dirty = True
+            self._request_frame(self.time_var.get())
             return
         
         if not self.is_selecting or self.selection_start is None:
@@ -844,8 +1874,6 @@ class UltimateVideoBlurTool:
             start_time, end_time = 0.0, self.duration
             
         blur_strength = self.blur_var.get()
-        if blur_strength % 2 == 0:
-            blur_strength += 1
             
         region = BlurRegion(x=video_x1, y=video_y1, width=width, height=height,
             start_time=start_time, end_time=end_time, blur_strength=blur_strength)
@@ -854,8 +1882,8 @@ class UltimateVideoBlurTool:
         if self.auto_track_var.get():
             frame = self._get_current_frame()
             if frame is not None:
-                current_frame = int(self.time_var.get() * self.fps)
-                region.tracked_positions[current_frame] = (video_x1, video_y1, width, height)
+                current_frame = self._frame_at(self.time_var.get())
+                region.add_position(current_frame, video_x1, video_y1, width, height)
                 self._track_region_forward(region, frame, current_frame)
         
         self.blur_regions.append(region)
@@ -879,17 +1907,23 @@ class UltimateVideoBlurTool:
             # Check for resize handles
             handle = self._get_resize_handle(event.x, event.y, region_idx)
             if handle in ('nw', 'se'):
-                self.canvas.config(cursor="size_nw_se")
+                self._set_cursor("size_nw_se")
             elif handle in ('ne', 'sw'):
-                self.canvas.config(cursor="size_ne_sw")
+                self._set_cursor("size_ne_sw")
             else:
-                self.canvas.config(cursor="fleur")  # Move cursor
+                self._set_cursor("fleur")  # Move cursor
         elif self.preset_size:
-            self.canvas.config(cursor="target")
+            self._set_cursor("target")
         else:
-            self.canvas.config(cursor="crosshair")
+            self._set_cursor("crosshair")
             self.hovered_region = None
 
+    def _set_cursor(self, cursor: str):
+        """Change the canvas cursor, skipping the Tk round-trip when it is already set"""
+        if cursor != self._canvas_cursor:
+            self._canvas_cursor = cursor
+            self.canvas.config(cursor=cursor)
+
     def _on_canvas_scroll(self, event):
         """Handle scroll wheel for timeline or blur adjustment"""
         if self.cap is None:
@@ -900,11 +1934,9 @@ class UltimateVideoBlurTool:
         if self.hovered_region is not None:
             region = self.blur_regions[self.hovered_region]
             new_blur = region.blur_strength + delta * 10
-            region.blur_strength = max(5, min(151, new_blur))
-            if region.blur_strength % 2 == 0:
-                region.blur_strength += 1
+            region.blur_strength = max(5, min(151, new_blur)) | 1
             self._update_regions_list()
-            self._show_frame(self.time_var.get())
+            self._request_frame(self.time_var.get())
         else:
             if event.state & 0x1:  # Shift key
                 self._seek_relative(delta)
@@ -947,11 +1979,16 @@ class UltimateVideoBlurTool:
 
     # ==================== CONTEXT MENU ACTIONS ====================
     
+    def _mark_text(self, which: str) -> str:
+        """Current frame's time for a start/end entry, rounded outward so that frame stays covered"""
+        current = self._frame_time(self.time_var.get()) * 100
+        return f"{(math.floor(current) if which == 'start' else math.ceil(current)) / 100:.2f}"
+
     def _set_start_from_current(self):
-        self.start_time_var.set(f"{self.time_var.get():.2f}")
+        self.start_time_var.set(self._mark_text('start'))
 
     def _set_end_from_current(self):
-        self.end_time_var.set(f"{self.time_var.get():.2f}")
+        self.end_time_var.set(self._mark_text('end'))
 
     def _duplicate_clicked_region(self):
         if self.clicked_region_idx is not None and self.clicked_region_idx < len(self.blur_regions):
@@ -973,14 +2010,14 @@ class UltimateVideoBlurTool:
 
     def _apply_from_here(self):
         if self.clicked_region_idx is not None and self.clicked_region_idx < len(self.blur_regions):
-            self.blur_regions[self.clicked_region_idx].start_time = self.time_var.get()
+            self.blur_regions[self.clicked_region_idx].start_time = self._frame_time(self.time_var.get())
             self._update_regions_list()
             self._show_frame(self.time_var.get())
         self._hide_quick_toolbar()
 
     def _apply_to_here(self):
         if self.clicked_region_idx is not None and self.clicked_region_idx < len(self.blur_regions):
-            self.blur_regions[self.clicked_region_idx].end_time = self.time_var.get()
+            self.blur_regions[self.clicked_region_idx].end_time = self._frame_time(self.time_var.get())
             self._update_regions_list()
             self._show_frame(self.time_var.get())
         self._hide_quick_toolbar()
@@ -1003,7 +2040,7 @@ class UltimateVideoBlurTool:
         if self.cap is None:
             messagebox.showwarning("Warning", "Please open a video first")
             return
-        if self.face_cascade is None:
+        if self.face_cascade is None and self.face_net_path is None:
             messagebox.showerror("Error", "Face detection model not loaded")
             return
             
@@ -1012,54 +2049,131 @@ class UltimateVideoBlurTool:
             return
             
         self.status_label.config(text="🔍 Detecting faces...")
-        self.root.update()
-        
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        scale = self.sensitivity_var.get()
-        
-        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=scale, minNeighbors=5, minSize=(30, 30))
-        if self.profile_cascade:
-            profiles = self.profile_cascade.detectMultiScale(gray, scaleFactor=scale, minNeighbors=5, minSize=(30, 30))
-            all_faces = list(faces) + list(profiles)
-        else:
-            all_faces = list(faces)
         
-        if len(all_faces) == 0:
-            self.status_label.config(text="❌ No faces detected")
-            messagebox.showinfo("Info", "No faces detected in current frame.")
-            return
-            
         try:
             start_time = float(self.start_time_var.get())
             end_time = float(self.end_time_var.get())
         except ValueError:
             start_time, end_time = self.time_var.get(), self.duration
-            
-        blur_strength = self.blur_var.get()
-        if blur_strength % 2 == 0:
-            blur_strength += 1
-            
-        current_frame = int(self.time_var.get() * self.fps)
         
-        for (x, y, w, h) in all_faces:
-            padding = int(w * 0.2)
-            x, y = max(0, x - padding), max(0, y - padding)
-            w = min(self.video_width - x, w + 2 * padding)
-            h = min(self.video_height - y, h + 2 * padding)
-            
-            region = BlurRegion(x=x, y=y, width=w, height=h,
-                start_time=start_time, end_time=end_time,
-                blur_strength=blur_strength, mode=BlurMode.FACE)
+        # Tk variables are read here; detection and tracking run on the detect worker
+        settings = (self.sensitivity_var.get(), self._detect_max_side(), start_time, end_time,
+                    self.blur_var.get(), self.auto_track_var.get())
+        self._detect_worker.submit(self._detect_faces_job, frame, self._frame_at(self.time_var.get()),
+                                   *settings)
+
+    def _detect_faces_job(self, frame: np.ndarray, current_frame: int, scale: float, max_side: int,
+                          start_time: float, end_time: float, blur_strength: int, auto_track: bool):
+        """Detect worker: find faces in frame and track them forward, then hand regions to the UI"""
+        try:
+            if self.face_net_path is not None:
+                # YuNet finds frontal and profile faces in one pass
+                if self.face_net is None:
+                    self.face_net = self._new_face_detector()
+                all_faces = list(self._detect_faces(self.face_net, frame, scale, max_side))
+            else:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                faces = self._detect_faces(self.face_cascade, gray, scale, max_side)
+                if self.profile_cascade:
+                    profiles = self._detect_faces(self.profile_cascade, gray, scale, max_side)
+                    all_faces = list(faces) + list(profiles)
+                else:
+                    all_faces = list(faces)
             
-            if self.auto_track_var.get():
-                region.tracked_positions[current_frame] = (x, y, w, h)
-                self._track_region_forward(region, frame, current_frame)
+            if len(all_faces) == 0:
+                self.root.after(0, self._report_nothing_detected, "❌ No faces detected",
+                                "No faces detected in current frame.")
+                return
             
-            self.blur_regions.append(region)
+            regions = []
+            tracked = []
+            for x, y, w, h in self._pad_face_boxes(all_faces).tolist():
+                region = BlurRegion(x=x, y=y, width=w, height=h,
+                    start_time=start_time, end_time=end_time,
+                    blur_strength=blur_strength, mode=BlurMode.FACE)
+                
+                if auto_track:
+                    region.add_position(current_frame, x, y, w, h)
+                    tracked.append(region)
+                
+                regions.append(region)
             
+            # One decode pass feeds every face's tracker
+            self._track_regions_forward(tracked, frame, current_frame, scale, max_side)
+            self.root.after(0, self._add_detected_regions, regions, f"✅ {len(all_faces)} face(s) detected")
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Error", f"Face detection failed: {e}")
+
+    def _pad_face_boxes(self, faces) -> np.ndarray:
+        """Face boxes padded by 20% of their width on each side, clamped to the frame, in one pass"""
+        boxes = np.array(faces, dtype=np.int64).reshape(-1, 4)
+        padding = (boxes[:, 2] * 0.2).astype(np.int64)
+        xs = np.maximum(boxes[:, 0] - padding, 0)
+        ys = np.maximum(boxes[:, 1] - padding, 0)
+        ws = np.minimum(self.video_width - xs, boxes[:, 2] + 2 * padding)
+        hs = np.minimum(self.video_height - ys, boxes[:, 3] + 2 * padding)
+        return np.stack([xs, ys, ws, hs], axis=1)
+
+    def _add_detected_regions(self, regions: List[BlurRegion], status: str):
+        """UI side of a detect job: add its regions and refresh"""
+        self.blur_regions.extend(regions)
         self._update_regions_list()
         self._show_frame(self.time_var.get())
-        self.status_label.config(text=f"✅ {len(all_faces)} face(s) detected")
+        self.status_label.config(text=status)
+
+    def _report_nothing_detected(self, status: str, message: Optional[str] = None):
+        self.status_label.config(text=status)
+        if message:
+            messagebox.showinfo("Info", message)
+
+    def _detect_faces(self, detector, image: np.ndarray, scale: float, max_side: int) -> np.ndarray:
+        """Detect on image (gray for a cascade, BGR for YuNet) shrunk to max_side; full-size boxes"""
+        h, w = image.shape[:2]
+        s = max_side / max(h, w) if 0 < max_side < max(h, w) else 1.0
+        if s < 1.0:
+            image = cv2.resize(image, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+        if hasattr(detector, 'detectMultiScale'):
+            if self.use_opencl and not isinstance(detector, CudaCascadeClassifier):
+                # A UMat input sends the cascade through OpenCV's OpenCL Haar/LBP path
+                image = cv2.UMat(image)
+            min_size = max(1, int(30 * s))
+            faces = detector.detectMultiScale(image, scaleFactor=scale, minNeighbors=5,
+                                              minSize=(min_size, min_size))
+        else:
+            detector.setInputSize((image.shape[1], image.shape[0]))
+            _, found = detector.detect(image)
+            # Rows are (x, y, w, h, 5 landmarks, score); boxes may start slightly off-frame
+            faces = () if found is None else np.maximum(found[:, :4], 0)
+        faces = np.asarray(faces).reshape(-1, 4)
+        if s < 1.0:
+            faces = faces / s
+        return faces.astype(np.int64)
+
+    def _new_face_detector(self):
+        """A face detector for one thread: YuNet if its model was found, else the frontal cascade"""
+        if self.face_net_path is None:
+            if self.use_cuda:
+                try:
+                    return CudaCascadeClassifier(self.face_cascade_path)
+                except (AttributeError, cv2.error):
+                    # No cudaobjdetect module, or a cascade format the CUDA loader rejects
+                    pass
+            return cv2.CascadeClassifier(self.face_cascade_path)
+        if self.use_cuda:
+            backend, target = cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA
+        else:
+            backend, target = cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU
+        return cv2.FaceDetectorYN.create(self.face_net_path, "", (320, 320), YUNET_SCORE_THRESHOLD,
+                                         0.3, 5000, backend, target)
+
+    def _detect_max_side(self) -> int:
+        """Detection long side from the slider; its maximum means full resolution"""
+        max_side = int(self.detect_size_var.get())
+        return 0 if max_side >= FACE_DETECT_FULL_SIDE else max_side
+
+    def _update_detect_size_label(self, value):
+        max_side = int(float(value))
+        self.detect_size_label.config(text="Full" if max_side >= FACE_DETECT_FULL_SIDE else str(max_side))
 
     def _scan_all_faces(self):
         """Scan entire video for faces"""
@@ -1069,76 +2183,194 @@ class UltimateVideoBlurTool:
         if not messagebox.askyesno("Scan Video", "This will scan the entire video for faces.\nThis may take a while. Continue?"):
             return
         self.is_processing = True
-        threading.Thread(target=self._scan_faces_thread, daemon=True).start()
+        # Tk variables are read here; the scan runs on the detect worker
+        self._detect_worker.submit(self._scan_faces_thread, self.sensitivity_var.get(),
+                                   self._detect_max_side())
 
-    def _scan_faces_thread(self):
-        """Background thread for face scanning"""
+    def _scan_faces_thread(self, scale: float, max_side: int):
+        """Aggregator stage of the face scan: decode -> detect (worker pool) -> collect"""
         try:
-            cap = cv2.VideoCapture(self.video_path)
-            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap = self._open_capture(self.video_path)
+            total = max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
             interval = max(1, int(self.fps / 2))
+            # Haar only needs gray: take the decoder's Y plane instead of converting to BGR and back
+            luma = self.face_net_path is None and self._decode_luma_only(cap)
+            log_level = cv2.utils.logging.getLogLevel()
+            if luma:
+                # OpenCV warns on every raw frame that it treats the YUV buffer as 8UC1
+                cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_ERROR)
             detected = []
-            scale = self.sensitivity_var.get()
             
-            frame_num = 0
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                if frame_num % interval == 0:
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    faces = self.face_cascade.detectMultiScale(gray, scaleFactor=scale, minNeighbors=5, minSize=(30, 30))
+            sampled = queue.Queue(maxsize=SCAN_QUEUE_DEPTH)
+            results = queue.Queue()
+            errors: List[Exception] = []
+            cancelled = threading.Event()
+            workers = SCAN_DETECT_WORKERS
+            
+            # Stretches start on sampled frames; the last runs to the end whatever the reported count
+            readers = max(1, min(SCAN_READ_WORKERS, total // (interval * SCAN_QUEUE_DEPTH)))
+            starts = [total * i // readers // interval * interval for i in range(readers)]
+            caps = [cap] + [self._open_capture(self.video_path) for _ in range(readers - 1)]
+            if luma:
+                for extra in caps[1:]:
+                    self._decode_luma_only(extra)
+            read_stages = [threading.Thread(target=self._scan_read_stage,
+                                            args=(c, sampled, start, stop, interval, errors, cancelled),
+                                            daemon=True)
+                           for c, start, stop in zip(caps, starts, starts[1:] + [None])]
+            stages = read_stages + [threading.Thread(target=self._scan_end_reads,
+                                                     args=(read_stages, sampled, workers), daemon=True)]
+            stages += [threading.Thread(target=self._scan_detect_stage,
+                                        args=(sampled, results, scale, max_side, errors, cancelled),
+                                        daemon=True)
+                       for _ in range(workers)]
+            # Detectors already run one per core; OpenCV's own pool on top of them would oversubscribe
+            cv2.setNumThreads(max(1, (os.cpu_count() or 1) // workers))
+            for stage in stages:
+                stage.start()
+            
+            last_update = 0.0
+            remaining = workers
+            # Stretches finish out of order, so progress counts frames covered rather than position
+            scanned = 0
+            try:
+                while remaining:
+                    item = results.get()
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    if self._closing.is_set():
+                        # Window closed: readers stop and the detectors drain what is queued
+                        cancelled.set()
+                        continue
+                    frame_num, faces = item
+                    scanned += interval
                     for (x, y, w, h) in faces:
                         detected.append((frame_num, x, y, w, h))
-                    progress = (frame_num / total) * 100
-                    self.root.after(0, lambda p=progress: self.progress_var.set(p))
-                frame_num += 1
-            cap.release()
-            self.root.after(0, lambda: self._process_detected_faces(detected))
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL:
+                        last_update = now
+                        self.root.after(0, self._set_scan_progress, min(scanned, total), total)
+            finally:
+                for stage in stages:
+                    stage.join()
+                for c in caps:
+                    c.release()
+                cv2.utils.logging.setLogLevel(log_level)
+                cv2.setNumThreads(OPENCV_THREADS)
+            
+            if self._closing.is_set():
+                return
+            if errors:
+                raise errors[0]
+            # Workers finish out of order; clustering expects detections in frame order
+            detected.sort(key=lambda d: d[0])
+            self.root.after(0, self._process_detected_faces, detected)
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Scan failed: {e}"))
+            self.root.after(0, messagebox.showerror, "Error", f"Scan failed: {e}")
         finally:
             self.is_processing = False
 
+    def _decode_luma_only(self, cap) -> bool:
+        """Have cap return raw decoder frames if their first plane is 8-bit luma; True if it will"""
+        try:
+            code = int(cap.get(cv2.CAP_PROP_CODEC_PIXEL_FORMAT))
+        except AttributeError:
+            return False
+        fourcc = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4))
+        return fourcc in LUMA_PLANE_FORMATS and cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+    def _scan_read_stage(self, cap, sampled: queue.Queue, start: int, stop: Optional[int], interval: int,
+                         errors: List[Exception], cancelled: threading.Event):
+        """Decode frames [start, stop), queueing (frame_num, image) for sampled ones"""
+        try:
+            if start:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            frame_num = start
+            # Only a copy is queued (gray for Haar, BGR for YuNet), so every sampled frame is
+            # retrieved into one buffer; a 2-D frame is already the decoder's luma plane
+            frame = None
+            color = self.face_net_path is not None
+            while not cancelled.is_set() and (stop is None or frame_num < stop):
+                # Unsampled frames are only grabbed, never retrieved, converted or queued
+                if not cap.grab():
+                    break
+                if frame_num % interval == 0:
+                    ret, frame = cap.retrieve(frame)
+                    if not ret:
+                        break
+                    if color or frame.ndim == 2:
+                        image = frame.copy()
+                    else:
+                        image = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    sampled.put((frame_num, image))
+                frame_num += 1
+        except Exception as e:
+            errors.append(e)
+
+    def _scan_end_reads(self, read_stages: List[threading.Thread], sampled: queue.Queue, workers: int):
+        """Once every reader is done, queue one None per detector"""
+        for stage in read_stages:
+            stage.join()
+        for _ in range(workers):
+            sampled.put(None)
+
+    def _scan_detect_stage(self, sampled: queue.Queue, results: queue.Queue, scale: float,
+                           max_side: int, errors: List[Exception], cancelled: threading.Event):
+        """Run a private face detector over queued frames, ending with a None sentinel"""
+        try:
+            detector = self._new_face_detector()
+            while (item := sampled.get()) is not None:
+                frame_num, image = item
+                faces = self._detect_faces(detector, image, scale, max_side)
+                results.put((frame_num, faces))
+        except Exception as e:
+            errors.append(e)
+            # Stop the reader and consume this worker's sentinel so it never blocks on a full queue
+            cancelled.set()
+            while sampled.get() is not None:
+                pass
+        finally:
+            results.put(None)
+
+    def _set_scan_progress(self, frame_num: int, total: int):
+        self.progress_var.set(frame_num / total * 100)
+        self.progress_label.config(text=f"Scanning: {frame_num}/{total}")
+
     def _process_detected_faces(self, detected):
         """Process detected faces into regions"""
+        self.progress_var.set(100)
+        self.progress_label.config(text="✅ Scan complete")
         if not detected:
             self.status_label.config(text="❌ No faces found")
             return
         blur_strength = self.blur_var.get()
-        if blur_strength % 2 == 0:
-            blur_strength += 1
         
-        # Simple clustering
-        used = set()
-        for i, (f1, x1, y1, w1, h1) in enumerate(detected):
-            if i in used:
-                continue
-            group = [(f1, x1, y1, w1, h1)]
-            used.add(i)
-            for j, (f2, x2, y2, w2, h2) in enumerate(detected):
-                if j in used:
-                    continue
-                if abs(x1 - x2) < w1 and abs(y1 - y2) < h1:
-                    group.append((f2, x2, y2, w2, h2))
-                    used.add(j)
+        # Simple clustering: the first unclaimed detection claims every unclaimed one near it,
+        # tested against all remaining detections at once
+        faces = np.array(detected, dtype=np.int64).reshape(-1, 5)
+        unused = np.ones(len(faces), dtype=bool)
+        while (remaining := np.flatnonzero(unused)).size:
+            f1, x1, y1, w1, h1 = faces[remaining[0]]
+            near = (np.abs(faces[remaining, 1] - x1) < w1) & (np.abs(faces[remaining, 2] - y1) < h1)
+            near[0] = True
+            group = faces[remaining[near]]
+            unused[remaining[near]] = False
             
-            frames = [g[0] for g in group]
             region = BlurRegion(
-                x=int(np.mean([g[1] for g in group])),
-                y=int(np.mean([g[2] for g in group])),
-                width=int(np.mean([g[3] for g in group])),
-                height=int(np.mean([g[4] for g in group])),
-                start_time=min(frames) / self.fps,
-                end_time=max(frames) / self.fps,
+                x=int(group[:, 1].mean()),
+                y=int(group[:, 2].mean()),
+                width=int(group[:, 3].mean()),
+                height=int(group[:, 4].mean()),
+                start_time=int(group[:, 0].min()) / self.fps,
+                end_time=int(group[:, 0].max()) / self.fps,
                 blur_strength=blur_strength, mode=BlurMode.FACE)
-            for (f, x, y, w, h) in group:
-                region.tracked_positions[f] = (x, y, w, h)
+            for f, x, y, w, h in group.tolist():
+                region.add_position(f, x, y, w, h)
             self.blur_regions.append(region)
         
         self._update_regions_list()
         self._show_frame(self.time_var.get())
-        self.progress_var.set(100)
         self.status_label.config(text=f"✅ Face regions created")
 
     def _detect_license_plates(self):
@@ -1151,22 +2383,6 @@ class UltimateVideoBlurTool:
             return
         
         self.status_label.config(text="🔍 Detecting plates...")
-        self.root.update()
-        
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 50, 150)
-        contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-        
-        plates = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            ratio = w / h if h > 0 else 0
-            if 2 < ratio < 5 and w > 60 and h > 20:
-                plates.append((x, y, w, h))
-        
-        if not plates:
-            self.status_label.config(text="❌ No plates detected")
-            return
             
         try:
             start_time = float(self.start_time_var.get())
@@ -1174,57 +2390,200 @@ class UltimateVideoBlurTool:
         except ValueError:
             start_time, end_time = self.time_var.get(), self.duration
         
-        blur_strength = self.blur_var.get()
-        if blur_strength % 2 == 0:
-            blur_strength += 1
-        
-        for (x, y, w, h) in plates[:5]:
-            region = BlurRegion(x=x, y=y, width=w, height=h,
-                start_time=start_time, end_time=end_time,
-                blur_strength=blur_strength, mode=BlurMode.LICENSE_PLATE)
-            self.blur_regions.append(region)
+        frame_number = max(0, min(self._frame_at(self.time_var.get()), self.total_frames - 1))
+        self._detect_worker.submit(self._detect_plates_job, frame, (self.video_path, frame_number),
+                                   start_time, end_time, self.blur_var.get())
+
+    def _detect_plates_job(self, frame: np.ndarray, cache_key: Tuple[str, int], start_time: float,
+                           end_time: float, blur_strength: int):
+        """Detect worker: find plate-shaped contours in frame, then hand regions to the UI"""
+        try:
+            cached = self._plate_cache
+            if cached is not None and cached[0] == cache_key:
+                plates = cached[1]
+            else:
+                plates = self._find_plates(frame)
+                self._plate_cache = (cache_key, plates)
+            
+            if not plates:
+                self.root.after(0, self._report_nothing_detected, "❌ No plates detected")
+                return
+            
+            regions = [BlurRegion(x=x, y=y, width=w, height=h,
+                           start_time=start_time, end_time=end_time,
+                           blur_strength=blur_strength, mode=BlurMode.LICENSE_PLATE)
+                       for (x, y, w, h) in plates]
+            self.root.after(0, self._add_detected_regions, regions, f"✅ {len(regions)} plate(s) detected")
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Error", f"Plate detection failed: {e}")
+
+    def _find_plates(self, frame: np.ndarray) -> List[List[int]]:
+        """Up to five plate-shaped [x, y, w, h] contour boxes from the frame's Canny edges"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, PLATE_DETECT_MAX_WIDTH / gray.shape[1])
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        edges = cv2.Canny(gray, 50, 150)
+        contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
         
+        # Plate-shaped boxes, in frame pixels: wider than 60, taller than 20, aspect ratio between 2 and 5
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.float64).reshape(-1, 4)
+        rects = (rects / scale).astype(np.int32)
+        widths, heights = rects[:, 2], rects[:, 3]
+        ratio = widths / np.maximum(heights, 1)
+        return rects[(ratio > 2) & (ratio < 5) & (widths > 60) & (heights > 20)][:5].tolist()
+
+    def _release_track_cap(self):
+        """Detect worker: drop the tracking capture so the next track opens the current video"""
+        with self._track_cap_lock:
+            if self._track_cap is not None:
+                self._track_cap.release()
+                self._track_cap = None
+
+    def _track_region_forward(self, region: BlurRegion, initial_frame: np.ndarray, start_frame: int,
+                              status: Optional[str] = None):
+        """Track a region forward from start_frame on the detect worker, which owns the tracking capture"""
+        if self.auto_track_var.get():
+            # Positions grow on a copy so the preview never reads a half-built track
+            track = replace(region, tracked_positions=TrackedPositions())
+            track.add_position(start_frame, region.x, region.y, region.width, region.height)
+            self._detect_worker.submit(self._track_region_job, region, track, initial_frame, start_frame,
+                                       self.sensitivity_var.get(), self._detect_max_side(), status)
+
+    def _track_region_job(self, region: BlurRegion, track: BlurRegion, initial_frame: np.ndarray,
+                          start_frame: int, scale: float, max_side: int, status: Optional[str]):
+        """Detect worker: track a UI-started region, then hand its positions to the UI"""
+        try:
+            self._track_regions_forward([track], initial_frame, start_frame, scale, max_side)
+            self.root.after(0, self._set_tracked_positions, region, track.tracked_positions, status)
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Error", f"Tracking failed: {e}")
+
+    def _set_tracked_positions(self, region: BlurRegion, positions: TrackedPositions, status: Optional[str]):
+        """UI side of a tracking job: swap in the finished track and refresh"""
+        region.tracked_positions = positions
         self._update_regions_list()
         self._show_frame(self.time_var.get())
-        self.status_label.config(text=f"✅ {len(plates[:5])} plate(s) detected")
+        if status:
+            self.status_label.config(text=status)
 
-    def _track_region_forward(self, region: BlurRegion, initial_frame: np.ndarray, start_frame: int):
-        """Track a region forward using CSRT tracker"""
-        if not self.auto_track_var.get():
+    def _track_regions_forward(self, regions: List[BlurRegion], initial_frame: np.ndarray, start_frame: int,
+                               scale: float, max_side: int):
+        """Track regions forward with one tracker each, sharing a single decode pass"""
+        if not regions:
             return
+        
+        # (region, tracker, last frame to track, last box) for each region still being followed
+        active = []
+        for region in regions:
+            box = (region.x, region.y, region.width, region.height)
+            tracker = self._create_tracker(region)
+            tracker.init(initial_frame, box)
+            end_frame = min(self._frame_at(region.end_time), start_frame + 300)
+            active.append((region, tracker, end_frame, box))
+        # Faces whose tracker failed: same tuples with tracker None. Periodic re-detection, at the scale
+        # and detection size that found them, retries these and snaps tracked faces to fresh boxes
+        lost = []
+        detector = None
+        redetect_every = max(1, int(FACE_REDETECT_INTERVAL * self.fps))
+        
+        with self._track_cap_lock:
+            if self._track_cap is None:
+                self._track_cap = self._open_capture(self.video_path)
+                self._track_cap_next = 0
+            cap = self._track_cap
+            if self._track_cap_next != start_frame:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            
+            frame_num = start_frame
+            while not self._closing.is_set():
+                active = [entry for entry in active if frame_num < entry[2]]
+                lost = [entry for entry in lost if frame_num < entry[2]]
+                if not active and not lost:
+                    break
+                ret, frame = cap.read()
+                if not ret:
+                    frame_num = -1
+                    break
+                still_tracking = []
+                for region, tracker, end_frame, box in active:
+                    success, bbox = tracker.update(frame)
+                    if success:
+                        box = tuple(int(v) for v in bbox)
+                        region.add_position(frame_num, *box)
+                        still_tracking.append((region, tracker, end_frame, box))
+                    elif region.mode == BlurMode.FACE:
+                        lost.append((region, None, end_frame, box))
+                if (frame_num - start_frame) % redetect_every == 0:
+                    # Lost faces are looked for again, and tracked ones re-anchored before they drift
+                    faces = [entry for entry in still_tracking
+                             if entry[0].mode == BlurMode.FACE and frame_num > start_frame]
+                    faces += lost
+                else:
+                    faces = []
+                if faces:
+                    if detector is None:
+                        detector = self._new_face_detector()
+                    unmatched, found = self._reacquire_faces(detector, frame, faces, scale, max_side)
+                    still_tracking = [entry for entry in still_tracking if entry[0].mode != BlurMode.FACE]
+                    still_tracking += [entry for entry in unmatched if entry[1] is not None]
+                    lost = [entry for entry in unmatched if entry[1] is None]
+                    for region, _, end_frame, box in found:
+                        tracker = self._create_tracker(region)
+                        tracker.init(frame, box)
+                        region.add_position(frame_num, *box)
+                        still_tracking.append((region, tracker, end_frame, box))
+                active = still_tracking
+                frame_num += 1
+            self._track_cap_next = frame_num
+
+    def _reacquire_faces(self, detector, frame: np.ndarray, entries: List[tuple], scale: float,
+                         max_side: int) -> Tuple[List[tuple], List[tuple]]:
+        """Split face entries into (unmatched, matched with their new box) by detection IoU"""
+        image = frame if self.face_net_path is not None else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Padded like the boxes the regions were created with, so a found face keeps its margin
+        faces = self._pad_face_boxes(self._detect_faces(detector, image, scale, max_side))
+        unmatched, found = [], []
+        for region, tracker, end_frame, box in entries:
+            if len(faces):
+                # IoU of the last tracked box against every detection
+                x, y, w, h = box
+                ix = np.minimum(x + w, faces[:, 0] + faces[:, 2]) - np.maximum(x, faces[:, 0])
+                iy = np.minimum(y + h, faces[:, 1] + faces[:, 3]) - np.maximum(y, faces[:, 1])
+                inter = np.maximum(ix, 0) * np.maximum(iy, 0)
+                iou = inter / (w * h + faces[:, 2] * faces[:, 3] - inter)
+                best = int(np.argmax(iou))
+                if iou[best] >= FACE_REDETECT_MIN_IOU:
+                    found.append((region, tracker, end_frame, tuple(int(v) for v in faces[best])))
+                    faces = np.delete(faces, best, axis=0)
+                    continue
+            unmatched.append((region, tracker, end_frame, box))
+        return unmatched, found
+
+    def _create_tracker(self, region: BlurRegion):
+        """Per-region tracker: LK for rigid plates, else CUDA flow or CSRT, with LK when CSRT is missing"""
+        if region.mode == BlurMode.LICENSE_PLATE:
+            # Plates are rigid, textured and rarely change scale: sparse flow follows them far cheaper
+            return LucasKanadeTracker()
+        if self.use_cuda:
+            try:
+                return CudaFlowTracker()
+            except (AttributeError, cv2.error):
+                pass
         try:
-            tracker = cv2.TrackerCSRT_create()
+            return cv2.TrackerCSRT_create()
         except:
             try:
-                tracker = cv2.legacy.TrackerCSRT_create()
+                return cv2.legacy.TrackerCSRT_create()
             except:
-                return
-        
-        bbox = (region.x, region.y, region.width, region.height)
-        tracker.init(initial_frame, bbox)
-        
-        cap = cv2.VideoCapture(self.video_path)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-        
-        end_frame = int(region.end_time * self.fps)
-        frame_num = start_frame
-        
-        while frame_num < end_frame and frame_num - start_frame < 300:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            success, bbox = tracker.update(frame)
-            if success:
-                region.tracked_positions[frame_num] = tuple(int(v) for v in bbox)
-            else:
-                break
-            frame_num += 1
-        cap.release()
+                return LucasKanadeTracker()
 
     # ==================== REGION MANAGEMENT ====================
     
     def _update_regions_list(self):
-        """Update the regions treeview"""
+        """Update the regions treeview and the region timing arrays"""
+        self._region_schedule = self._build_region_schedule()
+        self._canvas_coords_dirty = True
         for item in self.regions_tree.get_children():
             self.regions_tree.delete(item)
         
@@ -1267,7 +2626,7 @@ class UltimateVideoBlurTool:
         try:
             self.blur_regions[idx].start_time = float(self.start_time_var.get())
             self.blur_regions[idx].end_time = float(self.end_time_var.get())
-            self.blur_regions[idx].blur_strength = self.blur_var.get()
+            self.blur_regions[idx].blur_strength = self.blur_var.get() | 1
         except ValueError:
             return
         self._update_regions_list()
@@ -1285,13 +2644,14 @@ class UltimateVideoBlurTool:
         if frame is None:
             return
         region = self.blur_regions[idx]
-        current_frame = int(self.time_var.get() * self.fps)
+        current_frame = self._frame_at(self.time_var.get())
         region.tracked_positions.clear()
-        region.tracked_positions[current_frame] = (region.x, region.y, region.width, region.height)
-        self._track_region_forward(region, frame, current_frame)
+        region.add_position(current_frame, region.x, region.y, region.width, region.height)
+        self._track_region_forward(region, frame, current_frame, status="✅ Region re-tracked")
         self._update_regions_list()
         self._show_frame(self.time_var.get())
-        self.status_label.config(text="✅ Region re-tracked")
+        if self.auto_track_var.get():
+            self.status_label.config(text="🎯 Re-tracking region...")
 
     def _clear_all_regions(self):
         self.blur_regions.clear()
@@ -1299,25 +2659,69 @@ class UltimateVideoBlurTool:
         if self.cap:
             self._show_frame(self.time_var.get())
 
+    def _save_regions(self):
+        if not self.blur_regions:
+            messagebox.showwarning("Warning", "No blur regions to save")
+            return
+        initial = f"{Path(self.video_path).stem}_regions.npz" if self.video_path else "regions.npz"
+        path = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("Blur regions", "*.npz")],
+                                            initialfile=initial)
+        if not path:
+            return
+        try:
+            save_regions(path, self.blur_regions)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save regions: {e}")
+            return
+        self.status_label.config(text=f"✅ {len(self.blur_regions)} region(s) saved")
+
+    def _load_regions(self):
+        """Replace the current regions with ones saved by _save_regions"""
+        path = filedialog.askopenfilename(filetypes=[("Blur regions", "*.npz"), ("All Files", "*.*")])
+        if not path:
+            return
+        try:
+            regions = load_regions(path)
+        except (OSError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not load regions: {e}")
+            return
+        self.blur_regions[:] = regions
+        self._update_regions_list()
+        if self.cap:
+            self._show_frame(self.time_var.get())
+        self.status_label.config(text=f"✅ {len(regions)} region(s) loaded")
+
     # ==================== TIMELINE AND PLAYBACK ====================
     
     def _on_timeline_change(self, value):
         if self.cap:
-            self._show_frame(float(value))
+            self._request_frame(float(value))
+
+    def _request_frame(self, time_seconds: float):
+        """Coalesce bursts of redraw requests; only the latest time is rendered once idle"""
+        self._pending_seek = time_seconds
+        if not self._seek_scheduled:
+            self._seek_scheduled = True
+            self.root.after_idle(self._drain_seek)
+
+    def _drain_seek(self):
+        time_seconds, self._pending_seek = self._pending_seek, None
+        self._seek_scheduled = False
+        if time_seconds is not None:
+            self._show_frame(time_seconds)
 
     def _set_time_from_slider(self, which: str):
-        current = self.time_var.get()
         if which == 'start':
-            self.start_time_var.set(f"{current:.2f}")
+            self.start_time_var.set(self._mark_text('start'))
         else:
-            self.end_time_var.set(f"{current:.2f}")
+            self.end_time_var.set(self._mark_text('end'))
 
     def _seek_relative(self, delta: float):
         if self.cap is None:
             return
         new_time = max(0, min(self.time_var.get() + delta, self.duration))
         self.time_var.set(new_time)
-        self._show_frame(new_time)
+        self._request_frame(new_time)
 
     def _seek_to(self, time: float):
         if self.cap is None:
@@ -1328,34 +2732,54 @@ class UltimateVideoBlurTool:
     def _step_frame(self, delta: int):
         if self.cap is None:
             return
-        current = int(self.time_var.get() * self.fps)
+        current = self._frame_at(self.time_var.get())
         new_frame = max(0, min(current + delta, self.total_frames - 1))
         new_time = new_frame / self.fps
         self.time_var.set(new_time)
-        self._show_frame(new_time)
+        self._request_frame(new_time)
 
     def _toggle_preview(self):
         if self.cap is None:
             return
         if self.preview_running:
             self.preview_running = False
+            if self._preview_after is not None:
+                self.root.after_cancel(self._preview_after)
+                self._preview_after = None
+            self._stop_prefetch()
             self.play_btn.config(text="▶️ Play")
+            self._report_profile()
         else:
             self.preview_running = True
             self.play_btn.config(text="⏸️ Pause")
-            threading.Thread(target=self._preview_loop, daemon=True).start()
-
-    def _preview_loop(self):
-        import time
-        while self.preview_running:
-            current = self.time_var.get() + 1/self.fps
-            if current >= self.duration:
-                self.preview_running = False
-                self.root.after(0, lambda: self.play_btn.config(text="▶️ Play"))
-                break
-            self.time_var.set(current)
-            self.root.after(0, lambda t=current: self._show_frame(t))
-            time.sleep(1/self.fps)
+            self._start_prefetch(self._frame_at(self.time_var.get()))
+            self._preview_due = time.perf_counter()
+            self._preview_after = self.root.after(0, self._preview_tick)
+
+    def _preview_tick(self):
+        """Advance playback one frame on the Tk loop and re-arm against a fixed wall-clock schedule"""
+        self._preview_after = None
+        if not self.preview_running:
+            return
+        # Over two periods behind: drop the frames whose time has passed rather than slow playback
+        late = time.perf_counter() - self._preview_due
+        skip = int(late * self.fps) if late > 2 / self.fps else 0
+        # Step by whole frames; accumulating 1/fps drifts and repeats or skips frames
+        frame_number = self._frame_at(self.time_var.get()) + 1 + skip
+        current = frame_number / self.fps
+        if current >= self.duration:
+            self.preview_running = False
+            self._stop_prefetch()
+            self.play_btn.config(text="▶️ Play")
+            return
+        self.time_var.set(current)
+        self._playhead = frame_number
+        self._render_playback_frame(current)
+        
+        # Next frame is due one period after this one was, on the fixed wall-clock schedule
+        self._preview_due += (1 + skip) / self.fps
+        delay_ms = max(1, int((self._preview_due - time.perf_counter()) * 1000))
+        self._preview_after = self.root.after(delay_ms, self._preview_tick)
 
     def _update_blur_label(self, value):
         val = self.blur_var.get()
@@ -1371,7 +2795,7 @@ class UltimateVideoBlurTool:
 
     def _set_preset_mode(self, w, h):
         self.preset_size = (w, h)
-        self.canvas.config(cursor="target")
+        self._set_cursor("target")
         self.status_label.config(text=f"🎯 Click to place {w}x{h} region")
 
     def _format_time(self, seconds: float) -> str:
@@ -1394,36 +2818,225 @@ class UltimateVideoBlurTool:
         if not output:
             return
         self.is_processing = True
+        # Tk variables are read here on the Tk thread; the blur workers only see the snapshot
+        self._export_exact_blur = not self.fast_blur_var.get()
         threading.Thread(target=self._export_thread, args=(output,), daemon=True).start()
 
     def _export_thread(self, output_path):
+        """Writer stage of the export pipeline: read -> blur (worker threads) -> write, in frame order"""
         try:
-            cap = cv2.VideoCapture(self.video_path)
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_path, fourcc, self.fps, (self.video_width, self.video_height))
+            cap = self._open_export_capture()
+            out = self._open_writer(output_path)
+            
+            if self.use_cuda:
+                # One stream and one set of device buffers: the GPU path stays on a single worker
+                blur_fns = [self._apply_blur_regions_cuda]
+            elif self.use_opencl:
+                blur_fns = [self._apply_blur_regions_ocl] * EXPORT_BLUR_WORKERS
+            else:
+                # One reusable blur target per worker instead of per-region allocations; decoded
+                # frames belong to the pipeline, so they are blurred in place rather than copied
+                shape = (self.video_height, self.video_width, 3)
+                blur_fns = [functools.partial(self._apply_blur_regions, inplace=True,
+                                              scratch=np.empty(shape, np.uint8))
+                            for _ in range(EXPORT_BLUR_WORKERS)]
+            raw_frames = queue.Queue(maxsize=EXPORT_QUEUE_DEPTH)
+            blurred_frames = queue.Queue(maxsize=EXPORT_QUEUE_DEPTH)
+            errors: List[Exception] = []
+            cancelled = threading.Event()
+            schedule = self._build_region_schedule()
+            segments = self._build_frame_segments(schedule, self.total_frames)
+            
+            stages = [threading.Thread(target=self._export_read_stage,
+                                       args=(cap, raw_frames, len(blur_fns), errors, cancelled), daemon=True)]
+            stages += [threading.Thread(target=self._export_blur_stage,
+                                        args=(raw_frames, blurred_frames, apply_blur, schedule, segments,
+                                              errors, cancelled),
+                                        daemon=True)
+                       for apply_blur in blur_fns]
+            # Split the cores between the blur workers instead of giving each OpenCV's full pool
+            cv2.setNumThreads(max(1, (os.cpu_count() or 1) // len(blur_fns)))
+            for stage in stages:
+                stage.start()
             
             frame_num = 0
-            while True:
-                ret, frame = cap.read()
+            last_update = 0.0
+            remaining = len(blur_fns)
+            # Workers finish frames out of order; hold early ones until their turn comes
+            pending: List[Tuple[int, np.ndarray]] = []
+            try:
+                while remaining:
+                    item = blurred_frames.get()
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    heapq.heappush(pending, item)
+                    while pending and pending[0][0] == frame_num:
+                        out.write(heapq.heappop(pending)[1])
+                        frame_num += 1
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL or frame_num >= self.total_frames:
+                        last_update = now
+                        self.root.after(0, self._set_export_progress, frame_num)
+            except Exception:
+                # Stop the reader and keep the upstream stages from blocking on a full queue
+                cancelled.set()
+                while remaining:
+                    if blurred_frames.get() is None:
+                        remaining -= 1
+                raise
+            finally:
+                for stage in stages:
+                    stage.join()
+                cv2.setNumThreads(OPENCV_THREADS)
+                cap.release()
+                # Raises if a piped encoder failed, so a broken file is never reported as exported
+                out.release()
+            
+            if errors:
+                raise errors[0]
+            self.root.after(0, self._export_complete, output_path)
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Error", f"Export failed: {e}")
+        finally:
+            self.is_processing = False
+
+    def _set_export_progress(self, frame_num: int):
+        self.progress_var.set(frame_num / self.total_frames * 100)
+        self.progress_label.config(text=f"Processing: {frame_num}/{self.total_frames}")
+
+    def _open_export_capture(self):
+        """Export source: OpenCV if it got hardware decode, else an FFmpeg pipe with -hwaccel auto"""
+        cap = self._open_capture(self.video_path)
+        hw_decode = cap.get(getattr(cv2, 'CAP_PROP_HW_ACCELERATION', -1)) > 0
+        if hw_decode or shutil.which("ffmpeg") is None:
+            return cap
+        cap.release()
+        return FFmpegReader(self.video_path, (self.video_width, self.video_height))
+
+    def _open_writer(self, output_path: str):
+        """Best available H.264 writer: FFmpeg pipe, then OpenCV's FFmpeg backend, else mp4v"""
+        if not self._pipe_encoder_probed:
+            self._pipe_encoder = probe_pipe_encoder()
+            self._pipe_encoder_probed = True
+        size = (self.video_width, self.video_height)
+        # The probe encodes an even-sized frame; H.264 in yuv420p rejects odd widths and heights
+        if self._pipe_encoder and self.video_width % 2 == 0 and self.video_height % 2 == 0:
+            return FFmpegWriter(output_path, self._pipe_encoder, self.fps, size)
+        
+        # OpenCV's bundled FFmpeg picks a hardware H.264 encoder itself when asked to
+        out = cv2.VideoWriter(output_path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*'avc1'), self.fps, size,
+                              [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if out.isOpened():
+            return out
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(output_path, fourcc, self.fps, size)
+
+    def _build_region_schedule(self):
+        """Snapshot regions as columns: start-sorted times for O(log n) lookups, plus geometry"""
+        regions = list(self.blur_regions)
+        starts = np.array([r.start_time for r in regions], dtype=np.float64)
+        order = np.argsort(starts, kind='stable')
+        ends = np.array([r.end_time for r in regions], dtype=np.float64)[order]
+        # (x, y, w, h, ksize) and tracked flag per region, in original order
+        geometry = np.array([(r.x, r.y, r.width, r.height, r.blur_strength) for r in regions],
+                            dtype=np.int64).reshape(-1, 5)
+        tracked = np.array([bool(r.tracked_positions) for r in regions], dtype=bool)
+        return regions, order, starts[order], ends, geometry, tracked
+
+    def _current_schedule(self):
+        """Preview-side schedule, rebuilt if regions were edited without a list refresh"""
+        if self._schedule_dirty or len(self._region_schedule[0]) != len(self.blur_regions):
+            self._region_schedule = self._build_region_schedule()
+            self._schedule_dirty = False
+        return self._region_schedule
+
+    def _active_indices(self, schedule, current_time: float) -> np.ndarray:
+        """Original-order indices of the schedule's regions active at current_time"""
+        _, order, starts, ends, _, _ = schedule
+        n = np.searchsorted(starts, current_time, side='right')
+        return np.sort(order[:n][ends[:n] >= current_time])
+
+    def _build_frame_segments(self, schedule, total_frames: int):
+        """Split frames [0, total_frames) where the active set changes: (segment starts, active indices)"""
+        _, order, starts, ends, _, _ = schedule
+        times = np.arange(total_frames) / self.fps
+        # Same start <= t <= end test as _active_indices, resolved once per region instead of per frame
+        first = np.empty(len(order), np.int64)
+        stop = np.empty(len(order), np.int64)
+        first[order] = np.searchsorted(times, starts, side='left')
+        stop[order] = np.searchsorted(times, ends, side='right')
+        bounds = np.unique(np.concatenate(([0], first, stop)))
+        return bounds, [np.flatnonzero((first <= b) & (b < stop)) for b in bounds]
+
+    def _regions_active_at(self, schedule, current_time: float) -> List[BlurRegion]:
+        """Regions from a schedule active at current_time, in their original order"""
+        return [schedule[0][i] for i in self._active_indices(schedule, current_time)]
+
+    def _export_read_stage(self, cap, raw_frames: queue.Queue, workers: int, errors: List[Exception],
+                           cancelled: threading.Event):
+        """Decode (frame_num, frame) pairs into the raw queue, then one None per blur worker"""
+        try:
+            frame_num = 0
+            while not cancelled.is_set():
+                with self._tick("read"):
+                    ret, frame = cap.read()
                 if not ret:
                     break
-                current_time = frame_num / self.fps
-                frame = self._apply_blur_regions(frame, current_time, frame_num)
-                out.write(frame)
+                raw_frames.put((frame_num, frame))
                 frame_num += 1
-                progress = (frame_num / self.total_frames) * 100
-                self.root.after(0, lambda p=progress: self.progress_var.set(p))
-                self.root.after(0, lambda f=frame_num: self.progress_label.config(text=f"Processing: {f}/{self.total_frames}"))
-            
-            cap.release()
-            out.release()
-            self.root.after(0, lambda: self._export_complete(output_path))
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Export failed: {e}"))
+            errors.append(e)
         finally:
-            self.is_processing = False
+            for _ in range(workers):
+                raw_frames.put(None)
+
+    def _export_blur_stage(self, raw_frames: queue.Queue, blurred_frames: queue.Queue, apply_blur,
+                           schedule, segments, errors: List[Exception], cancelled: threading.Event):
+        """Blur worker: frames from the raw queue into the write queue, ending with a None sentinel"""
+        bounds, active_sets = segments
+        try:
+            while (item := raw_frames.get()) is not None:
+                frame_num, frame = item
+                current_time = frame_num / self.fps
+                if frame_num < self.total_frames:
+                    active = active_sets[np.searchsorted(bounds, frame_num, side='right') - 1]
+                else:
+                    # Past the container's reported frame count; fall back to a direct lookup
+                    active = self._active_indices(schedule, current_time)
+                if active.size:
+                    frame = apply_blur(frame, current_time, frame_num, schedule=schedule, active=active)
+                blurred_frames.put((frame_num, frame))
+        except Exception as e:
+            errors.append(e)
+            # Stop the reader and consume this worker's sentinel so it never blocks on a full queue
+            cancelled.set()
+            while raw_frames.get() is not None:
+                pass
+        finally:
+            blurred_frames.put(None)
+
+    def _tick(self, name: str):
+        """Accumulate wall time for a block under name when DEBUG_PROFILE is on"""
+        if not DEBUG_PROFILE:
+            return contextlib.nullcontext()
+        return self._tick_timer(name)
+
+    @contextlib.contextmanager
+    def _tick_timer(self, name: str):
+        start = cv2.getTickCount()
+        try:
+            yield
+        finally:
+            self._stats[name] += (cv2.getTickCount() - start) / cv2.getTickFrequency()
+
+    def _report_profile(self):
+        if DEBUG_PROFILE and self._stats:
+            print("Profile: " + ", ".join(f"{k}={v:.3f}s" for k, v in sorted(self._stats.items())))
+            self._stats.clear()
 
     def _export_complete(self, path):
+        self._report_profile()
         self.progress_var.set(100)
         self.progress_label.config(text="✅ Export complete!")
         self.status_label.config(text="✅ Video exported")
@@ -1431,12 +3044,6 @@ class UltimateVideoBlurTool:
 
 
 def main():
-    try:
-        from PIL import Image, ImageTk
-    except ImportError:
-        import subprocess
-        subprocess.run(["pip", "install", "Pillow", "-q"])
-    
     root = tk.Tk()
     app = UltimateVideoBlurTool(root)
     root.mainloop()